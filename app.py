@@ -285,7 +285,8 @@ if search_button and search_query:
             query=search_query,
             clusters=candidates,
             embedding_model=embedding_model,
-            min_final_score=0.35
+            min_final_score=0.35,
+            top_k=50
         )
     
     if results:
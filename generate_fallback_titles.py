@@ -4,94 +4,131 @@ Uses simple keyword extraction from signal texts
 """
 
 import os
+import time
+import asyncio
 from dotenv import load_dotenv
-from qdrant_client import QdrantClient
-from collections import Counter
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import PointStruct
 import re
 
 load_dotenv()
 
+# Points per upsert request (Qdrant throughput flattens out around 64-256)
+UPSERT_BATCH_SIZE = 128
+
+# Points per scroll page (Qdrant Cloud maximum)
+SCROLL_PAGE_SIZE = 1000
+
+# Maximum number of in-flight upsert requests
+MAX_CONCURRENT_UPSERTS = 8
+
+# Capitalized words used as title keywords
+_CAP_RE = re.compile(r'\b[A-Z][a-z]+\b')
+
 def _fallback_title(signals):
     """Fallback title generation - extract capitalized words"""
-    words = []
+    # Single-pass count (vocabularies here are tiny, no Counter needed)
+    counts = {}
     for s in signals[:5]:
-        words.extend(re.findall(r'\b[A-Z][a-z]+\b', s))
+        for w in _CAP_RE.findall(s):
+            counts[w] = counts.get(w, 0) + 1
     
-    if not words:
+    if not counts:
         return "Emerging Technology Cluster"
     
-    common = Counter(words).most_common(3)
+    # Stable sort keeps first-seen order on ties, like Counter.most_common
+    common = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:3]
     title_words = [w for w, _ in common]
     return " / ".join(title_words)
 
-def main():
-    client = QdrantClient(
-        url=os.getenv("QDRANT_URL"),
-        api_key=os.getenv("QDRANT_API_KEY")
-    )
-    
-    print("[INFO] Loading all signals...")
-    all_signals = {}
+async def _scroll(client, collection_name, payload_fields):
+    """Stream every point of a collection, fetching only the given payload fields"""
     offset = None
     
     while True:
-        response = client.scroll(
-            collection_name="signals_hot",
-            limit=100,
+        points, next_offset = await client.scroll(
+            collection_name=collection_name,
+            limit=SCROLL_PAGE_SIZE,
             offset=offset,
-            with_payload=True
+            with_payload=payload_fields
         )
-        points, next_offset = response
         if not points:
             break
         
         for point in points:
-            sig_id = point.payload.get('signal_id')
-            text = point.payload.get('text', '')
-            if sig_id and text:
-                all_signals[sig_id] = text
+            yield point
         
         if next_offset is None:
             break
         offset = next_offset
+
+async def _load_signals(client):
+    """signal_id -> text for every signal"""
+    all_signals = {}
+    async for point in _scroll(client, "signals_hot", ["signal_id", "text"]):
+        sig_id = point.payload.get('signal_id')
+        text = point.payload.get('text', '')
+        if sig_id and text:
+            all_signals[sig_id] = text
+    return all_signals
+
+async def _load_clusters(client):
+    """(cluster_id, member_signal_ids) for every cluster"""
+    return [
+        (point.payload.get('cluster_id'), point.payload.get('member_signal_ids', []))
+        async for point in _scroll(client, "clusters_warm", ["cluster_id", "member_signal_ids"])
+    ]
+
+async def _upsert_batch(client, semaphore, pending):
+    """Upsert one batch of title points, returns number saved"""
+    async with semaphore:
+        try:
+            await client.upsert(
+                collection_name="cluster_titles",
+                points=[point for point, _ in pending],
+                wait=False
+            )
+        except Exception as e:
+            for point, title in pending:
+                print(f"  ❌ [{point.id[:8]}...] → {title} (failed: {e})")
+            return 0
+    
+    for point, title in pending:
+        print(f"  ✅ [{point.id[:8]}...] → {title}")
+    return len(pending)
+
+async def main():
+    client = AsyncQdrantClient(
+        url=os.getenv("QDRANT_URL"),
+        api_key=os.getenv("QDRANT_API_KEY"),
+        prefer_grpc=True  # gRPC (port 6334) is much faster than REST for bulk scroll/upsert
+    )
+    
+    # Both collections are independent, so scroll them concurrently
+    print("[INFO] Loading all signals and clusters...")
+    all_signals, cluster_members = await asyncio.gather(
+        _load_signals(client),
+        _load_clusters(client)
+    )
     
     print(f"[INFO] Loaded {len(all_signals)} signals")
     
-    print("[INFO] Loading clusters...")
-    offset = None
     clusters = []
-    
-    while True:
-        response = client.scroll(
-            collection_name="clusters_warm",
-            limit=100,
-            offset=offset,
-            with_payload=True
-        )
-        points, next_offset = response
-        if not points:
-            break
-        
-        for point in points:
-            cluster_id = point.payload.get('cluster_id')
-            member_ids = point.payload.get('member_signal_ids', [])
-            
-            # Get signal texts
-            signal_texts = [all_signals.get(sid, '') for sid in member_ids if sid in all_signals]
-            
-            if signal_texts:
-                clusters.append({
-                    'cluster_id': cluster_id,
-                    'signal_texts': signal_texts
-                })
+    for cluster_id, member_ids in cluster_members:
+        # Get signal texts
+        signal_texts = [all_signals.get(sid, '') for sid in member_ids if sid in all_signals]
         
-        if next_offset is None:
-            break
-        offset = next_offset
+        if signal_texts:
+            clusters.append({
+                'cluster_id': cluster_id,
+                'signal_texts': signal_texts
+            })
     
     print(f"[INFO] Found {len(clusters)} clusters with signals\n")
     
-    success_count = 0
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPSERTS)
+    tasks = []
+    batch = []
     
     for cluster in clusters:
         cluster_id = cluster['cluster_id']
@@ -100,24 +137,29 @@ def main():
         # Generate fallback title
         title = _fallback_title(signal_texts)
         
-        # Save to Qdrant cluster_titles collection
-        try:
-            # Use simple vector for title cache
-            client.upsert(
-                collection_name="cluster_titles",
-                points=[{
-                    "id": cluster_id,
-                    "vector": [0.5] * 384,  # Dummy embedding
-                    "payload": {
-                        "cluster_id": cluster_id,
-                        "title": title
-                    }
-                }]
-            )
-            print(f"  ✅ [{cluster_id[:8]}...] → {title}")
-            success_count += 1
-        except Exception as e:
-            print(f"  ❌ [{cluster_id[:8]}...] → {title} (failed: {e})")
+        # Queue for the Qdrant cluster_titles collection
+        batch.append((
+            PointStruct(
+                id=cluster_id,
+                vector=[0.5] * 384,  # Dummy embedding
+                payload={
+                    "cluster_id": cluster_id,
+                    "title": title,
+                    "updated_at": time.time()
+                }
+            ),
+            title
+        ))
+        
+        if len(batch) >= UPSERT_BATCH_SIZE:
+            tasks.append(asyncio.create_task(_upsert_batch(client, semaphore, batch)))
+            batch = []
+    
+    if batch:
+        tasks.append(asyncio.create_task(_upsert_batch(client, semaphore, batch)))
+    
+    success_count = sum(await asyncio.gather(*tasks))
+    await client.close()
     
     print(f"\n{'='*60}")
     print(f"✅ Successfully generated {success_count} fallback titles")
@@ -126,4 +168,4 @@ def main():
     print("run generate_missing_titles.py to upgrade to AI-generated titles.")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
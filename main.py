@@ -21,9 +21,9 @@ from src.clustering.proto_cluster import create_proto_cluster
 from src.clustering.intra_batch_cluster import cluster_batch
 from src.clustering.cluster_evolution import evolve_clusters
 from src.dashboard.feed import build_emerging_feed
-from src.scoring.critic_agent import evaluate_cluster
+from src.scoring.critic_agent import evaluate_clusters
 from src.scoring.controller_agent import controller_decide
-from src.dashboard.gemini_explainer import generate_human_cluster_title
+from src.dashboard.gemini_explainer import generate_cluster_titles
 
 VECTOR_SIZE = 384
 
@@ -103,11 +103,11 @@ def main(reset_seen_ids=False):
         print("[INFO] Using simplified cluster storage")
         cluster_memory = None
 
-    # 3) Collect embeddings with signals
+    # 3) Collect embeddings with signals (one batched encode for the whole ingest)
+    batch_embeddings = embedding_model.embed_batch([signal.text for signal in all_new_signals]).tolist()
     signals_with_embeddings = []
 
-    for signal in all_new_signals:
-        embedding = embedding_model.embed(signal.text)
+    for signal, embedding in zip(all_new_signals, batch_embeddings):
         signals_with_embeddings.append({
             "signal": signal.to_dict(),
             "embedding": embedding
@@ -153,10 +153,10 @@ def main(reset_seen_ids=False):
     candidate_pool = []
     demoted_clusters = []
     
-    for cluster in candidate_clusters:
-        # Critic evaluates cluster quality
-        critic_report = evaluate_cluster(cluster)
-        
+    # Critic evaluates cluster quality (all clusters in one batched pass)
+    critic_reports = evaluate_clusters(candidate_clusters)
+    
+    for cluster, critic_report in zip(candidate_clusters, critic_reports):
         # Controller makes final decision
         controller_decision = controller_decide(cluster, critic_report)
         
@@ -190,24 +190,20 @@ def main(reset_seen_ids=False):
 
     # Store ALL clusters (active + candidates) to Qdrant warm memory
     if cluster_memory:
-        new_cluster_count = 0
-        for cluster in candidate_clusters:
-            cluster_memory.upsert_cluster(
-                proto_cluster=cluster,
-                embedding_model=embedding_model
-            )
-            new_cluster_count += 1
+        cluster_memory.upsert_clusters_bulk(
+            clusters=candidate_clusters,
+            embedding_model=embedding_model
+        )
+        new_cluster_count = len(candidate_clusters)
         
         print(f"[INFO] Upserted {len(candidate_clusters)} clusters to Qdrant Cloud")
         
         # Generate titles for newly created clusters
         if new_cluster_count > 0:
             print(f"[INFO] Generating titles for {new_cluster_count} new clusters...")
-            for cluster in candidate_clusters:
-                signal_texts = [s["text"] for s in cluster["signals"]]
-                cluster_id = cluster["cluster_id"]
-                title = generate_human_cluster_title(signal_texts, cluster_id=cluster_id, use_cache=True)
-                print(f"  [{cluster_id[:8]}...] → {title}")
+            titles = generate_cluster_titles(candidate_clusters, use_cache=True)
+            for cluster, title in zip(candidate_clusters, titles):
+                print(f"  [{cluster['cluster_id'][:8]}...] → {title}")
             print(f"✅ Generated {new_cluster_count} cluster titles")
     else:
         print("[INFO] Skipping cluster storage to vector memory")
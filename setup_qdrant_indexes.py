@@ -64,6 +64,21 @@ def setup_indexes():
         else:
             print(f"[ERROR] Failed to create index: {e}")
     
+    # Create index on updated_at in cluster_titles (dashboard loads only newer titles)
+    print("[INFO] Creating index on 'updated_at' field in cluster_titles collection...")
+    try:
+        client.create_payload_index(
+            collection_name="cluster_titles",
+            field_name="updated_at",
+            field_schema=PayloadSchemaType.FLOAT
+        )
+        print("[INFO] ✅ Index on 'updated_at' created in cluster_titles")
+    except Exception as e:
+        if "already exists" in str(e).lower():
+            print("[INFO] Index on 'updated_at' already exists")
+        else:
+            print(f"[ERROR] Failed to create index: {e}")
+    
     print("\n" + "="*60)
     print("✅ INDEXES SETUP COMPLETE!")
     print("="*60)
@@ -3,17 +3,89 @@
 from typing import List, Dict, Any
 import numpy as np
 from datetime import datetime
-import uuid
 
+from src.clustering.proto_cluster import new_cluster_id
 
-def cosine_similarity(a: List[float], b: List[float]) -> float:
-    a = np.array(a)
-    b = np.array(b)
-    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+# Optional SIMD kernels (AVX-512/NEON) for cosine distance
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
 
 
-def compute_centroid(embeddings: List[List[float]]) -> List[float]:
-    return np.mean(np.array(embeddings), axis=0).tolist()
+def compute_centroid(embeddings: np.ndarray) -> np.ndarray:
+    return np.asarray(embeddings, dtype=np.float32).mean(axis=0)
+
+
+def _embed_grouped(embedding_model, groups: List[List[str]]) -> List[np.ndarray]:
+    """Embed several groups of texts with a single batched model call."""
+    flat_texts = [t for group in groups for t in group]
+    flat_embeddings = embedding_model.embed_batch(flat_texts)
+
+    grouped = []
+    start = 0
+    for group in groups:
+        grouped.append(flat_embeddings[start:start + len(group)])
+        start += len(group)
+    return grouped
+
+
+def _unit(v: np.ndarray) -> np.ndarray:
+    return (v / (np.linalg.norm(v) + 1e-12)).astype(np.float32, copy=False)
+
+
+def _set_centroid(candidate: Dict[str, Any], centroid: np.ndarray, centroid_unit: np.ndarray = None):
+    """Assign a centroid together with its cached unit vector (normalized once per change)."""
+    candidate["centroid"] = centroid
+    candidate["centroid_unit"] = _unit(centroid) if centroid_unit is None else centroid_unit
+
+
+class _CentroidIndex:
+    """
+    Unit-normalized candidate centroids stacked into one (K, d) matrix,
+    so a new cluster is compared against every candidate with a single GEMV.
+    Row i always corresponds to existing_candidates[i]. All vectors passed in
+    are expected to be unit length already (candidate["centroid_unit"]).
+    """
+
+    def __init__(self, unit_centroids: List[np.ndarray]):
+        self._matrix = None
+        self._size = 0
+        for unit_centroid in unit_centroids:
+            self.append(unit_centroid)
+
+    def append(self, unit_centroid: np.ndarray):
+        if self._matrix is None:
+            self._matrix = np.zeros((16, unit_centroid.shape[-1]), dtype=np.float32)
+        elif self._size == len(self._matrix):
+            # Grow in doubling blocks instead of vstack-ing one row at a time
+            grown = np.zeros((2 * len(self._matrix), self._matrix.shape[1]), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+        self._matrix[self._size] = unit_centroid
+        self._size += 1
+
+    def update(self, row: int, unit_centroid: np.ndarray):
+        self._matrix[row] = unit_centroid
+
+    def first_match(self, query: np.ndarray, threshold: float) -> int:
+        """Index of the first candidate with similarity >= threshold, or -1."""
+        if self._size == 0:
+            return -1
+        if simsimd is not None:
+            # All candidate distances in one SIMD kernel call
+            dists = np.asarray(simsimd.cdist(query[None, :], self._matrix[:self._size], metric="cosine"))
+            sims = 1.0 - dists.ravel()
+        else:
+            sims = self._matrix[:self._size] @ query
+        hits = np.flatnonzero(sims >= threshold)
+        return int(hits[0]) if hits.size else -1
+
+
+def _has_signal_embeddings(cluster: Dict[str, Any]) -> bool:
+    """True if the cluster already carries one embedding per signal (e.g. from cluster_batch)."""
+    signals = cluster.get("signals", [])
+    return len(signals) > 0 and len(cluster.get("embeddings", [])) == len(signals)
 
 
 def evolve_clusters(
@@ -27,58 +99,98 @@ def evolve_clusters(
     new_batch_clusters: proto-clusters formed in current run
     """
 
-    # Prepare existing candidates with centroids
+    # Planning: collect every text that needs embedding so the model is called once.
+    # Batch clusters that already hold their signal embeddings are not re-embedded.
+    candidates_to_embed = [c for c in existing_candidates if "centroid" not in c]
+    clusters_to_embed = [nc for nc in new_batch_clusters if not _has_signal_embeddings(nc)]
+    groups = [[s["text"] for s in c["signals"]] for c in candidates_to_embed]
+    groups += [[s["text"] for s in nc["signals"]] for nc in clusters_to_embed]
+
+    grouped_embeddings = _embed_grouped(embedding_model, groups)
+
+    # Scatter: existing candidates without centroids
+    for c, embeddings in zip(candidates_to_embed, grouped_embeddings):
+        c["embeddings"] = embeddings
+        _set_centroid(c, compute_centroid(embeddings))
+
+    # Candidates loaded from disk/Qdrant carry float64 lists; convert them once
+    # to contiguous float32 (4 bytes/element instead of a boxed Python float)
     for c in existing_candidates:
-        if "centroid" not in c:
-            texts = [s["text"] for s in c["signals"]]
-            embeddings = [embedding_model.embed(t) for t in texts]
-            c["embeddings"] = embeddings
-            c["centroid"] = compute_centroid(embeddings)
-
-    for new_cluster in new_batch_clusters:
-        texts = [s["text"] for s in new_cluster["signals"]]
-        new_embeddings = [embedding_model.embed(t) for t in texts]
+        if "centroid_unit" not in c:
+            _set_centroid(c, np.asarray(c["centroid"], dtype=np.float32))
+        c["embeddings"] = np.asarray(c.get("embeddings", []), dtype=np.float32).reshape(-1, c["centroid"].shape[-1])
+        if "signal_id_set" not in c:
+            c["signal_id_set"] = {s["signal_id"] for s in c["signals"]}
+
+    embedded = iter(grouped_embeddings[len(candidates_to_embed):])
+    new_cluster_embeddings = [
+        np.asarray(nc["embeddings"], dtype=np.float32) if _has_signal_embeddings(nc) else next(embedded)
+        for nc in new_batch_clusters
+    ]
+
+    index = _CentroidIndex([c["centroid_unit"] for c in existing_candidates])
+
+    # Running mean per merged candidate: row -> [mean, count, added embedding blocks].
+    # Centroids are updated in O(batch * d); embeddings are stacked once at the end.
+    merges = {}
+
+    for new_cluster, new_embeddings in zip(new_batch_clusters, new_cluster_embeddings):
         new_centroid = compute_centroid(new_embeddings)
+        new_centroid_unit = _unit(new_centroid)
 
-        merged = False
+        # Same first-match-wins policy as comparing candidates in order
+        match = index.first_match(new_centroid_unit, similarity_threshold)
 
-        for candidate in existing_candidates:
-            sim = cosine_similarity(new_centroid, candidate["centroid"])
+        if match >= 0:
+            candidate = existing_candidates[match]
 
-            if sim >= similarity_threshold:
-                # Merge - but avoid duplicate signals
-                existing_signal_ids = {s["signal_id"] for s in candidate["signals"]}
-                
-                # Only add new signals that aren't already in the cluster
-                new_signals_to_add = [
-                    s for s in new_cluster["signals"] 
-                    if s["signal_id"] not in existing_signal_ids
-                ]
+            # Merge - but avoid duplicate signals
+            existing_signal_ids = candidate["signal_id_set"]
+            
+            # Only add new signals that aren't already in the cluster,
+            # reusing the embeddings computed in the batched call above
+            keep = [
+                i for i, s in enumerate(new_cluster["signals"])
+                if s["signal_id"] not in existing_signal_ids
+            ]
+            
+            if keep:
+                new_signals_to_add = [new_cluster["signals"][i] for i in keep]
+                new_signal_embeddings = new_embeddings[keep]
                 
-                if new_signals_to_add:
-                    # Compute embeddings only for truly new signals
-                    new_signal_embeddings = [
-                        embedding_model.embed(s["text"]) 
-                        for s in new_signals_to_add
-                    ]
-                    
-                    candidate["signals"].extend(new_signals_to_add)
-                    candidate["embeddings"].extend(new_signal_embeddings)
-                    candidate["centroid"] = compute_centroid(candidate["embeddings"])
-                    candidate["signal_count"] = len(candidate["signals"])
-                
-                merged = True
-                break
+                candidate["signals"].extend(new_signals_to_add)
+                existing_signal_ids.update(s["signal_id"] for s in new_signals_to_add)
+                candidate["signal_count"] = len(candidate["signals"])
+
+                state = merges.get(match)
+                if state is None:
+                    stored = candidate["embeddings"]
+                    mean = compute_centroid(stored) if len(stored) else np.zeros(stored.shape[1], dtype=np.float32)
+                    state = merges[match] = [mean, len(stored), []]
+                mean, n, added = state
+                k = len(keep)
+                state[0] = (mean * n + new_signal_embeddings.sum(axis=0)) / (n + k)
+                state[1] = n + k
+                added.append(new_signal_embeddings)
 
-        if not merged:
+                _set_centroid(candidate, state[0])
+                index.update(match, candidate["centroid_unit"])
+        else:
             # create new candidate
             existing_candidates.append({
-                "cluster_id": str(uuid.uuid4()),
+                "cluster_id": new_cluster_id(),
                 "signals": new_cluster["signals"],
+                "signal_id_set": {s["signal_id"] for s in new_cluster["signals"]},
                 "embeddings": new_embeddings,
                 "centroid": new_centroid,
+                "centroid_unit": new_centroid_unit,
                 "signal_count": len(new_cluster["signals"]),
                 "created_at": datetime.utcnow().isoformat()
             })
+            index.append(new_centroid_unit)
+
+    for row, (_, _, added) in merges.items():
+        candidate = existing_candidates[row]
+        candidate["embeddings"] = np.vstack([candidate["embeddings"], *added])
 
     return existing_candidates
\ No newline at end of file
@@ -4,12 +4,6 @@ from typing import List, Dict, Any
 import numpy as np
 
 
-def cosine_similarity(a: List[float], b: List[float]) -> float:
-    a = np.array(a)
-    b = np.array(b)
-    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
-
-
 def cluster_batch(
     signals_with_embeddings: List[Dict[str, Any]],
     similarity_threshold: float = 0.80
@@ -23,25 +17,33 @@ def cluster_batch(
     ]
     """
 
+    if not signals_with_embeddings:
+        return []
+
+    # Stack once into a contiguous float32 (N, d) matrix with precomputed row norms,
+    # instead of re-parsing Python lists on every comparison
+    E = np.asarray([item["embedding"] for item in signals_with_embeddings], dtype=np.float32)
+    norms = np.linalg.norm(E, axis=1)
+
     clusters = []
+    members = []         # row indices into E per cluster
+    centroid_sums = []   # running sum of member embeddings (centroid = sum / n)
+    centroid_norms = []
 
-    for item in signals_with_embeddings:
+    for idx, item in enumerate(signals_with_embeddings):
         placed = False
 
-        for cluster in clusters:
-            sim = cosine_similarity(
-                item["embedding"],
-                cluster["centroid"]
-            )
+        for k, cluster in enumerate(clusters):
+            sim = float(E[idx] @ cluster["centroid"] / (norms[idx] * centroid_norms[k]))
 
             if sim >= similarity_threshold:
                 cluster["signals"].append(item["signal"])
 
                 # update centroid (mean)
-                cluster["embeddings"].append(item["embedding"])
-                cluster["centroid"] = np.mean(
-                    cluster["embeddings"], axis=0
-                ).tolist()
+                members[k].append(idx)
+                centroid_sums[k] += E[idx]
+                cluster["centroid"] = centroid_sums[k] / len(members[k])
+                centroid_norms[k] = float(np.sqrt(np.vdot(cluster["centroid"], cluster["centroid"])))
 
                 placed = True
                 break
@@ -49,8 +51,14 @@ def cluster_batch(
         if not placed:
             clusters.append({
                 "signals": [item["signal"]],
-                "embeddings": [item["embedding"]],
-                "centroid": item["embedding"]
+                "centroid": E[idx].copy()
             })
+            members.append([idx])
+            centroid_sums.append(E[idx].copy())
+            centroid_norms.append(float(norms[idx]))
+
+    # Each cluster's embeddings as one (n, d) float32 block
+    for cluster, rows in zip(clusters, members):
+        cluster["embeddings"] = E[rows]
 
     return clusters
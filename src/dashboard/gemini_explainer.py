@@ -1,13 +1,19 @@
 import os
-from typing import List
+import asyncio
+import atexit
+from typing import Any, Dict, List
 import google.generativeai as genai
 from dotenv import load_dotenv
 import time
 import hashlib
 import json
+import random
+import re
+import sqlite3
+import threading
 from pathlib import Path
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams, PointStruct
+from qdrant_client.http.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, Range
 
 # Load environment variables
 load_dotenv()
@@ -17,13 +23,64 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
 
-# Persistent cache file (fallback only)
+# Persistent local cache (SQLite, one row per title) and legacy JSON file
+CACHE_DB = Path("cluster_title_cache.db")
 CACHE_FILE = Path("cluster_title_cache.json")
 CACHE_COLLECTION = "cluster_titles"
 
+# Concurrent Gemini requests for bulk title generation (free tier: ~10-60 RPM)
+TITLE_CONCURRENCY = 6
+
+# Title retries back off 8s, 16s, 32s (plus jitter) so a per-minute quota can reset
+TITLE_MAX_RETRIES = 4
+TITLE_RETRY_BASE_DELAY = 8.0  # seconds
+
+# Error text of failures worth retrying (rate limits, timeouts, 5xx)
+_TRANSIENT_MARKERS = ("429", "quota", "500", "503", "504", "unavailable", "deadline", "timeout", "timed out")
+
+# Capitalized words used by the fallback title
+_CAP_RE = re.compile(r'\b[A-Z][a-z]+\b')
+
 # In-memory cache for this session
 _title_cache = {}
 
+# Local SQLite connection (shared across Streamlit threads)
+_db = None
+_db_lock = threading.Lock()
+
+# Write-behind buffer of title points for Qdrant Cloud
+CLOUD_FLUSH_BATCH = 64
+CLOUD_FLUSH_INTERVAL = 2.0  # seconds
+# Delta sync re-reads this far behind the last seen updated_at, so points whose
+# non-blocking upsert became visible late are still picked up (entries are keyed)
+CLOUD_SYNC_MARGIN = 300.0  # seconds
+_pending_points = []
+_flush_lock = threading.Lock()
+_flush_timer = None
+
+
+def _get_db():
+    """Open the local title cache database, creating it on first use."""
+    global _db
+    if _db is None:
+        _db = sqlite3.connect(CACHE_DB, isolation_level=None, check_same_thread=False)
+        _db.execute("PRAGMA journal_mode=WAL")
+        _db.execute("PRAGMA synchronous=NORMAL")
+        _db.execute("CREATE TABLE IF NOT EXISTS titles (key TEXT PRIMARY KEY, title TEXT NOT NULL)")
+        # cloud_version: newest Qdrant updated_at already mirrored locally
+        _db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL)")
+        
+        # One-time import of the legacy JSON cache
+        empty = _db.execute("SELECT COUNT(*) FROM titles").fetchone()[0] == 0
+        if empty and CACHE_FILE.exists():
+            try:
+                with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+                _db.executemany("INSERT OR REPLACE INTO titles(key, title) VALUES(?, ?)", legacy.items())
+            except Exception as e:
+                print(f"[WARNING] Could not import legacy title cache: {e}")
+    return _db
+
 
 def _get_qdrant_client():
     """Get Qdrant Cloud client if credentials available."""
@@ -32,7 +89,8 @@ def _get_qdrant_client():
             return QdrantClient(
                 url=os.getenv("QDRANT_URL"),
                 api_key=os.getenv("QDRANT_API_KEY"),
-                timeout=30
+                timeout=30,
+                prefer_grpc=True  # gRPC (port 6334) for lower-latency scroll/upsert
             )
         except Exception as e:
             print(f"[WARNING] Failed to connect to Qdrant: {e}")
@@ -66,17 +124,45 @@ def _ensure_cache_collection():
 
 
 def _load_cache():
-    """Load title cache from Qdrant Cloud or fallback to disk."""
+    """
+    Load title cache from the local snapshot, then pull newer titles from Qdrant Cloud.
+    
+    The local database mirrors every title this process has seen, so only
+    points with updated_at newer than the last synced stamp are scrolled.
+    """
     global _title_cache
     
-    # Try loading from Qdrant Cloud first
+    # Warm from the local snapshot first (single disk read, no network)
+    try:
+        with _db_lock:
+            db = _get_db()
+            rows = db.execute("SELECT key, title FROM titles").fetchall()
+            stamp = db.execute("SELECT value FROM meta WHERE key = 'cloud_version'").fetchone()
+        _title_cache = dict(rows)
+        cloud_version = stamp[0] if stamp else None
+        print(f"[INFO] Loaded {len(_title_cache)} titles from local cache file")
+    except Exception as e:
+        print(f"[WARNING] Could not load title cache from file: {e}")
+        _title_cache = {}
+        cloud_version = None
+    
+    # Then fetch only the delta from Qdrant Cloud
     client = _get_qdrant_client()
     if client and _ensure_cache_collection():
         try:
+            scroll_filter = None
+            if cloud_version is not None:
+                scroll_filter = Filter(must=[
+                    FieldCondition(key="updated_at", range=Range(gt=cloud_version - CLOUD_SYNC_MARGIN))
+                ])
+            
+            fetched = []
+            newest = cloud_version
             offset = None
             while True:
                 response = client.scroll(
                     collection_name=CACHE_COLLECTION,
+                    scroll_filter=scroll_filter,
                     limit=100,
                     offset=offset,
                     with_payload=True,
@@ -91,66 +177,110 @@ def _load_cache():
                     cluster_id = point.payload.get("cluster_id")
                     title = point.payload.get("title")
                     if cluster_id and title:
-                        _title_cache[cluster_id] = title
+                        fetched.append((cluster_id, title))
+                    updated_at = point.payload.get("updated_at")
+                    if updated_at is not None and (newest is None or updated_at > newest):
+                        newest = updated_at
                 
                 if next_offset is None:
                     break
                 offset = next_offset
             
-            print(f"[INFO] Loaded {len(_title_cache)} titles from Qdrant Cloud cache")
-            return
+            _title_cache.update(fetched)
+            with _db_lock:
+                db = _get_db()
+                db.executemany("INSERT OR REPLACE INTO titles(key, title) VALUES(?, ?)", fetched)
+                if newest is not None:
+                    db.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('cloud_version', ?)", (newest,))
+            
+            print(f"[INFO] Loaded {len(fetched)} new titles from Qdrant Cloud cache")
         except Exception as e:
             print(f"[WARNING] Could not load cache from Qdrant: {e}")
-    
-    # Fallback to local file
-    if CACHE_FILE.exists():
-        try:
-            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                _title_cache = json.load(f)
-            print(f"[INFO] Loaded {len(_title_cache)} titles from local cache file")
-        except Exception as e:
-            print(f"[WARNING] Could not load title cache from file: {e}")
-            _title_cache = {}
-    else:
-        _title_cache = {}
 
 
 def _save_cache_to_cloud(cluster_id: str, title: str):
-    """Save a single title to Qdrant Cloud cache."""
+    """Queue a single title for the Qdrant Cloud cache (and save it locally)."""
+    _save_cache(cluster_id, title)
+    
+    if not (os.getenv("QDRANT_URL") and os.getenv("QDRANT_API_KEY")):
+        return False
+    
+    # Use cluster_id directly as string UUID (avoids hash collisions)
+    point = PointStruct(
+        id=cluster_id,  # Qdrant supports string UUIDs as point IDs
+        vector=[0.0] * 384,  # Match collection dimension (384)
+        payload={
+            "cluster_id": cluster_id,
+            "title": title
+            # updated_at is stamped by flush_cloud_cache at upsert time
+        }
+    )
+    
+    # Write-behind: flush when a full batch is pending, otherwise within
+    # CLOUD_FLUSH_INTERVAL seconds
+    with _flush_lock:
+        _pending_points.append(point)
+        batch_full = len(_pending_points) >= CLOUD_FLUSH_BATCH
+    
+    if batch_full:
+        return flush_cloud_cache()
+    _schedule_flush()
+    return True
+
+
+def flush_cloud_cache() -> bool:
+    """Upsert all pending title points to Qdrant Cloud in one request."""
+    global _pending_points
+    
+    with _flush_lock:
+        batch, _pending_points = _pending_points, []
+    if not batch:
+        return True
+    
     client = _get_qdrant_client()
     if not client or not _ensure_cache_collection():
-        # Fallback to local file
-        _save_cache()
         return False
     
+    # Stamp when the batch is actually written, not when it was queued
+    updated_at = time.time()
+    for point in batch:
+        point.payload["updated_at"] = updated_at
+    
     try:
-        # Use cluster_id directly as string UUID (avoids hash collisions)
-        point = PointStruct(
-            id=cluster_id,  # Qdrant supports string UUIDs as point IDs
-            vector=[0.0] * 384,  # Match collection dimension (384)
-            payload={
-                "cluster_id": cluster_id,
-                "title": title,
-                "updated_at": time.time()
-            }
-        )
-        
         client.upsert(
             collection_name=CACHE_COLLECTION,
-            points=[point]
+            points=batch,
+            wait=False
         )
         return True
     except Exception as e:
-        print(f"[WARNING] Could not save to Qdrant cache: {e}")
-        _save_cache()  # Fallback to local file
+        print(f"[WARNING] Could not save {len(batch)} titles to Qdrant cache: {e}")
         return False
 
 
-def _save_cache():
-    """Save title cache to local file (fallback only)."""
+def _schedule_flush():
+    """Start the background flush timer unless one is already pending."""
+    global _flush_timer
+    
+    with _flush_lock:
+        if _flush_timer is None or not _flush_timer.is_alive():
+            _flush_timer = threading.Timer(CLOUD_FLUSH_INTERVAL, flush_cloud_cache)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+
+# Drain queued titles when the process exits
+atexit.register(flush_cloud_cache)
+
+
+def _save_cache(key: str, title: str):
+    """Save a single title to the local cache (one-row upsert)."""
     try:
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(_title_cache, f, ensure_ascii=False, indent=2)
+        with _db_lock:
+            _get_db().execute(
+                "INSERT OR REPLACE INTO titles(key, title) VALUES(?, ?)",
+                (key, title)
+            )
     except Exception as e:
         print(f"Warning: Could not save title cache: {e}")
 
@@ -161,10 +291,74 @@ _load_cache()
 
 def _get_cache_key(signals: List[str]) -> str:
     """Generate a unique cache key for a list of signals."""
-    # Use first 3 signals sorted - more stable than all 10
-    signal_sample = sorted(signals[:3])
-    signal_text = "|".join(signal_sample)
-    return hashlib.md5(signal_text.encode('utf-8')).hexdigest()
+    # Use first 3 signals sorted - more stable than all 10.
+    # Hash a short prefix of each signal incrementally instead of
+    # encoding one large joined string.
+    h = hashlib.blake2b(digest_size=16)
+    for s in sorted(signals[:3]):
+        h.update(s[:64].encode('utf-8'))
+        h.update(b'|')
+    return h.hexdigest()
+
+
+def _title_cache_key(signals: List[str], cluster_id: str = None) -> str:
+    """Use cluster_id as cache key if available, otherwise fall back to signal-based key."""
+    if cluster_id:
+        # cluster_id is already the UUID, don't add prefix (cache stores it directly)
+        return cluster_id
+    return _get_cache_key(signals)
+
+
+def _build_title_prompt(signals: List[str]) -> str:
+    """Build the Gemini prompt for a cluster title."""
+    # Prepare signal texts (limit to 1-5 signals to prevent hallucination on large clusters)
+    signal_sample = signals[:5] if len(signals) >= 5 else signals[:max(1, len(signals))]
+    signal_text = "\n".join([f"- {s[:150]}" for s in signal_sample])  # Truncate long signals
+    
+    # Prompt for title generation
+    return f"""Analyze these emerging technology signals and create a single, clear title that explains what trend is emerging.
+
+Signals:
+{signal_text}
+
+Requirements:
+- Maximum 8-10 words
+- Non-technical language
+- Describes the trend, not just keywords
+- Understandable by non-technical users
+- Avoid jargon
+
+Output ONLY the title, nothing else."""
+
+
+def _clean_title(text: str) -> str:
+    """Strip the model output and ensure it's not too long."""
+    title = text.strip()
+    if len(title.split()) > 12:
+        title = " ".join(title.split()[:10]) + "..."
+    return title
+
+
+def _store_title(cache_key: str, cluster_id: str, title: str):
+    """Cache a title in memory and save it to Qdrant Cloud (or locally)."""
+    _title_cache[cache_key] = title
+    if cluster_id:
+        _save_cache_to_cloud(cluster_id, title)
+    else:
+        _save_cache(cache_key, title)  # Local only for non-cluster-id keys
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Rate limits and temporary outages: retry them, and never cache their fallback title."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in _TRANSIENT_MARKERS)
+
+
+def _title_retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, so concurrent title requests don't retry in lockstep."""
+    return TITLE_RETRY_BASE_DELAY * (2 ** attempt) * random.uniform(1.0, 1.5)
 
 
 def generate_human_cluster_title(signals: List[str], cluster_id: str = None, use_cache: bool = True) -> str:
@@ -183,12 +377,7 @@ def generate_human_cluster_title(signals: List[str], cluster_id: str = None, use
         # Fallback to simple extraction if API key not available
         return _fallback_title(signals)
     
-    # Use cluster_id as cache key if available, otherwise fall back to signal-based key
-    if cluster_id:
-        # cluster_id is already the UUID, don't add prefix (cache stores it directly)
-        cache_key = cluster_id
-    else:
-        cache_key = _get_cache_key(signals)
+    cache_key = _title_cache_key(signals, cluster_id)
     
     # Check cache first
     if use_cache and cache_key in _title_cache:
@@ -198,56 +387,103 @@ def generate_human_cluster_title(signals: List[str], cluster_id: str = None, use
         return _title_cache[cache_key]
     
     try:
-        # Prepare signal texts (limit to 1-5 signals to prevent hallucination on large clusters)
-        signal_sample = signals[:5] if len(signals) >= 5 else signals[:max(1, len(signals))]
-        signal_text = "\n".join([f"- {s[:150]}" for s in signal_sample])  # Truncate long signals
-        
-        # Prompt for title generation
-        prompt = f"""Analyze these emerging technology signals and create a single, clear title that explains what trend is emerging.
-
-Signals:
-{signal_text}
-
-Requirements:
-- Maximum 8-10 words
-- Non-technical language
-- Describes the trend, not just keywords
-- Understandable by non-technical users
-- Avoid jargon
-
-Output ONLY the title, nothing else."""
+        prompt = _build_title_prompt(signals)
 
         # Use gemini-2.5-flash-lite (faster, prevents hallucination)
         model = genai.GenerativeModel('gemini-2.5-flash-lite')
         response = model.generate_content(prompt)
         
-        title = response.text.strip()
-        
-        # Ensure it's not too long
-        if len(title.split()) > 12:
-            title = " ".join(title.split()[:10]) + "..."
+        title = _clean_title(response.text)
+        _store_title(cache_key, cluster_id, title)
+        return title
         
-        # Cache the result in memory and save to Qdrant Cloud
-        _title_cache[cache_key] = title
+    except Exception as e:
+        print(f"Gemini API error in title generation: {e}")
+        fallback = _fallback_title(signals)
+        # Cache fallback too, unless the failure was temporary and a later run should retry
+        if not _is_transient_error(e):
+            _store_title(cache_key, cluster_id, fallback)
+        return fallback
+
+
+async def generate_human_cluster_title_async(signals: List[str], cluster_id: str = None, use_cache: bool = True) -> str:
+    """
+    Async variant of generate_human_cluster_title using generate_content_async.
+    
+    Retries rate limits and temporary errors with jittered exponential backoff
+    (about 8s, 16s, 32s). If they persist, the fallback title is returned but
+    not cached, so the next run asks Gemini again.
+    """
+    if not GEMINI_API_KEY:
+        return _fallback_title(signals)
+    
+    cache_key = _title_cache_key(signals, cluster_id)
+    
+    if use_cache and cache_key in _title_cache:
         if cluster_id:
-            _save_cache_to_cloud(cluster_id, title)
-        else:
-            _save_cache()  # Fallback to local file for non-cluster-id keys
+            # SQLite write and a possible Qdrant flush: keep them off the event loop
+            await asyncio.to_thread(_save_cache_to_cloud, cluster_id, _title_cache[cache_key])
+        return _title_cache[cache_key]
+    
+    try:
+        prompt = _build_title_prompt(signals)
+        model = genai.GenerativeModel('gemini-2.5-flash-lite')
         
-        return title
+        for attempt in range(TITLE_MAX_RETRIES):
+            try:
+                response = await model.generate_content_async(prompt)
+                break
+            except Exception as retry_error:
+                if _is_transient_error(retry_error) and attempt < TITLE_MAX_RETRIES - 1:
+                    await asyncio.sleep(_title_retry_delay(attempt))
+                    continue
+                raise
         
+        title = _clean_title(response.text)
+        await asyncio.to_thread(_store_title, cache_key, cluster_id, title)
+        return title
+    
     except Exception as e:
         print(f"Gemini API error in title generation: {e}")
-        # Cache fallback too
         fallback = _fallback_title(signals)
-        _title_cache[cache_key] = fallback
-        if cluster_id:
-            _save_cache_to_cloud(cluster_id, fallback)
-        else:
-            _save_cache()
+        if not _is_transient_error(e):
+            await asyncio.to_thread(_store_title, cache_key, cluster_id, fallback)
         return fallback
 
 
+async def _generate_cluster_titles(clusters: List[Dict[str, Any]], use_cache: bool, concurrency: int) -> List[str]:
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def generate(cluster):
+        async with semaphore:
+            return await generate_human_cluster_title_async(
+                [s["text"] for s in cluster["signals"]],
+                cluster_id=cluster["cluster_id"],
+                use_cache=use_cache
+            )
+    
+    return await asyncio.gather(*(generate(c) for c in clusters))
+
+
+def generate_cluster_titles(
+    clusters: List[Dict[str, Any]],
+    use_cache: bool = True,
+    concurrency: int = TITLE_CONCURRENCY
+) -> List[str]:
+    """
+    Generate titles for many clusters concurrently.
+    
+    Args:
+        clusters: Cluster dicts with cluster_id and signals
+        use_cache: Whether to use cached titles (default: True)
+        concurrency: Maximum in-flight Gemini requests (keep within the RPM limit)
+    
+    Returns:
+        Titles in the same order as clusters
+    """
+    return asyncio.run(_generate_cluster_titles(clusters, use_cache, concurrency))
+
+
 def explain_cluster_with_gemini(cluster_signals: List[str], user_question: str) -> str:
     """
     Answer user questions about an emerging cluster using Gemini.
@@ -309,19 +545,17 @@ Provide a clear, helpful answer based only on the signals above."""
 def _fallback_title(signals: List[str]) -> str:
     """Fallback title generation when Gemini API is unavailable."""
     # Simple keyword extraction as fallback
-    from collections import Counter
-    import re
-    
-    words = []
+    counts = {}
     for s in signals[:5]:
         # Extract capitalized words and meaningful terms
-        words.extend(re.findall(r'\b[A-Z][a-z]+\b', s))
+        for w in _CAP_RE.findall(s):
+            counts[w] = counts.get(w, 0) + 1
     
-    if not words:
+    if not counts:
         return "Emerging Technology Cluster"
     
-    # Get top 3 most common words
-    common = Counter(words).most_common(3)
+    # Get top 3 most common words (stable sort keeps first-seen order on ties)
+    common = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:3]
     title_words = [w for w, _ in common]
     
     return " / ".join(title_words)
@@ -2,144 +2,22 @@ import networkx as nx
 from pyvis.network import Network
 import numpy as np
 import math
+from collections import Counter
+from src.utils.vectors import quantize_int8
+from src.dashboard.search import get_centroid_matrix
+
+# Optional SIMD kernels for batched cosine distance
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
 
 # Configuration
 MAX_SIGNALS_PER_CLUSTER = 25
 
-def cosine(a, b):
-    if a is None or b is None:
-        return 0.0
-    return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
-
-def build_cluster_graph(clusters, threshold=0.55):
-    G = nx.Graph()
-
-    for cluster in clusters:
-        cluster_id = cluster["cluster_id"]
-        cluster_label = cluster["label"]
-        signals = cluster["signals"]
-        embeddings = cluster["embeddings"]
-        total_signal_count = len(signals)
-
-        # Sort signals by timestamp (most recent first)
-        signals_with_embeddings = list(zip(signals, embeddings))
-        signals_with_embeddings.sort(key=lambda x: x[0]["timestamp"], reverse=True)
-        
-        # Cap visible signals
-        visible_signals = signals_with_embeddings[:MAX_SIGNALS_PER_CLUSTER]
-        hidden_count = total_signal_count - len(visible_signals)
-
-        # Add visible signal nodes
-        for i, (s, emb) in enumerate(visible_signals):
-            short_label = s["text"][:40] + "…"
-            G.add_node(
-                s["signal_id"],
-                label="",  # Hide label for cleanliness
-                title=s["text"],  # Full text on hover
-                size=6,
-                color="#8ecae6",
-                physics=True,  # Enable physics for dragging
-                shape='dot',  # Explicitly set shape to dot to minimize borders
-                borderWidth=0,  # Remove outer circle
-                borderWidthSelected=0
-            )
-
-        # Add signal-signal edges (only between visible signals and only strong connections)
-        for i in range(len(visible_signals)):
-            for j in range(i+1, len(visible_signals)):
-                sim = cosine(visible_signals[i][1], visible_signals[j][1])
-                if sim > 0.65:  # Higher threshold for cleaner graph
-                    # Fade edge color for large clusters
-                    edge_opacity = 1.0 if total_signal_count < 50 else 0.5 if total_signal_count < 100 else 0.3
-                    edge_color = f"rgba(14, 17, 23, {edge_opacity})"
-                    G.add_edge(
-                        visible_signals[i][0]["signal_id"],
-                        visible_signals[j][0]["signal_id"],
-                        value=sim,
-                        color=edge_color,
-                        smooth=False  # Straight lines
-                    )
-
-        # Calculate logarithmic cluster node size based on total signal count
-        # Formula: base_size + log_factor * log(1 + signal_count)
-        base_size = 35
-        log_factor = 15
-        cluster_size = base_size + log_factor * math.log(1 + total_signal_count)
-        
-        # Add cluster anchor node
-        cluster_node_id = f"cluster_{cluster_id}"
-        G.add_node(
-            cluster_node_id,
-            label=cluster_label,
-            title=f"{cluster_label} ({total_signal_count} signals)",
-            size=cluster_size,
-            color="#f4b000",
-            font={"size": 18, "color": "white"},
-            physics=True,  # Enable physics for dragging
-            borderWidth=0,
-            borderWidthSelected=0
-        )
-
-        # Connect cluster to visible signals
-        # Fade edge color for large clusters
-        edge_opacity = 1.0 if total_signal_count < 50 else 0.6 if total_signal_count < 100 else 0.4
-        cluster_edge_color = f"rgba(244, 176, 0, {edge_opacity})"
-        
-        for s, emb in visible_signals:
-            G.add_edge(
-                cluster_node_id,
-                s["signal_id"],
-                value=0.9,
-                color=cluster_edge_color,
-                smooth=False  # Straight lines
-            )
-        
-        # Add "+N more" collapsed node if there are hidden signals
-        if hidden_count > 0:
-            collapsed_node_id = f"collapsed_{cluster_id}"
-            G.add_node(
-                collapsed_node_id,
-                label=f"+{hidden_count} more",
-                title=f"This cluster has {hidden_count} more signals not shown in the graph.\nSelect the cluster below to view all {total_signal_count} signals.",
-                size=12,
-                color="#ff9500",
-                font={"size": 14, "color": "white"},
-                physics=True,
-                borderWidth=0,
-                borderWidthSelected=0,
-                shape='box'
-            )
-            
-            # Connect collapsed node to cluster hub
-            G.add_edge(
-                cluster_node_id,
-                collapsed_node_id,
-                value=0.9,
-                color="#ff9500",
-                smooth=False,
-                dashes=True
-            )
-
-    # Cross-cluster edges
-    for i in range(len(clusters)):
-        for j in range(i+1, len(clusters)):
-            if "centroid" in clusters[i] and "centroid" in clusters[j]:
-                sim = cosine(clusters[i]["centroid"], clusters[j]["centroid"])
-                if sim > 0.7:
-                    G.add_edge(
-                        f"cluster_{clusters[i]['cluster_id']}",
-                        f"cluster_{clusters[j]['cluster_id']}",
-                        value=sim,
-                        color="#ff006e",
-                        dashes=True,
-                        smooth=False  # Straight lines
-                    )
-
-    net = Network(height="600px", bgcolor="#0e1117", font_color="white")
-    net.from_nx(G)
-    
-    # Configure physics for initial layout only - will be disabled after stabilization
-    net.set_options("""
+# Physics/interaction options and the injected script are built once at import,
+# not on every graph rebuild.
+_PHYSICS_OPTIONS_JSON = """
     {
         "nodes": {
             "borderWidth": 0,
@@ -179,10 +57,10 @@ def build_cluster_graph(clusters, threshold=0.55):
             "solver": "barnesHut"
         }
     }
-    """)
-    
-    # Add custom JavaScript for click-to-show-persistent-text and group movement
-    custom_html = """
+    """
+
+# Custom JavaScript for click-to-show-persistent-text and group movement
+_CUSTOM_HTML = """
     <script type="text/javascript">
         var selectedNode = null;
         var physicsDisabled = false;
@@ -292,20 +170,202 @@ def build_cluster_graph(clusters, threshold=0.55):
         });
     </script>
     """
-    
-    try:
-        net.write_html("cluster_graph.html")
+
+# Pre-baked replacement for the closing body tag
+_CUSTOM_HTML_BODY_END = _CUSTOM_HTML + "</body>"
+
+def _stack_vectors(vectors):
+    """Stack vectors into a contiguous float32 matrix; missing (None) rows become zeros."""
+    dim = next((len(v) for v in vectors if v is not None), 0)
+    matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+    for i, v in enumerate(vectors):
+        if v is not None:
+            matrix[i] = v
+    return matrix
+
+def _similarity_matrix(matrix):
+    """All-pairs cosine similarity of the rows; rows with zero norm score 0.0."""
+    norms = np.linalg.norm(matrix, axis=1)
+    if simsimd is not None and len(matrix):
+        # int8 copy: a quarter of the memory traffic, dispatched to the i8 cosine kernel
+        quantized = quantize_int8(matrix)
+        sims = 1.0 - np.asarray(simsimd.cdist(quantized, quantized, metric="cosine"))
+    else:
+        # Normalize each row once, then the whole matrix is a single GEMM
+        unit = matrix / (norms[:, None] + 1e-12)
+        sims = unit @ unit.T
+    valid = norms > 0
+    sims[~valid, :] = 0.0
+    sims[:, ~valid] = 0.0
+    return sims
+
+def _pairs_above(sims, threshold):
+    """Upper-triangle (i < j) index pairs whose similarity exceeds threshold."""
+    rows, cols = np.triu_indices(len(sims), k=1)
+    keep = sims[rows, cols] > threshold
+    return rows[keep], cols[keep]
+
+def _similar_pairs(matrix, threshold):
+    """(i_idx, j_idx, sims) for row pairs i < j with cosine similarity above threshold."""
+    sims = _similarity_matrix(matrix)
+    rows, cols = _pairs_above(sims, threshold)
+    return rows, cols, sims[rows, cols]
+
+def _clusters_with_centroids(clusters):
+    """Clusters whose centroid can share one matrix: not None/empty and of the common length."""
+    with_centroids = [c for c in clusters if c.get("centroid") is not None and len(c["centroid"]) > 0]
+    if not with_centroids:
+        return []
+    # Like cosine() returning 0.0, malformed centroids just get no cross-cluster edges
+    dim = Counter(len(c["centroid"]) for c in with_centroids).most_common(1)[0][0]
+    return [c for c in with_centroids if len(c["centroid"]) == dim]
+
+def build_cluster_graph(clusters, threshold=0.55):
+    G = nx.Graph()
+
+    for cluster in clusters:
+        cluster_id = cluster["cluster_id"]
+        cluster_label = cluster["label"]
+        signals = cluster["signals"]
+        embeddings = cluster["embeddings"]
+        total_signal_count = len(signals)
+
+        # Sort signals by timestamp (most recent first)
+        paired_count = min(len(signals), len(embeddings))
+        order = sorted(range(paired_count), key=lambda k: signals[k]["timestamp"], reverse=True)
         
-        # Inject custom JavaScript into the generated HTML
-        with open("cluster_graph.html", "r", encoding="utf-8") as f:
-            html_content = f.read()
+        # Cap visible signals
+        order = order[:MAX_SIGNALS_PER_CLUSTER]
+        visible_signals = [(signals[k], embeddings[k]) for k in order]
+        hidden_count = total_signal_count - len(visible_signals)
         
-        # Insert custom script before closing body tag
-        html_content = html_content.replace("</body>", custom_html + "</body>")
+        # Reuse the contiguous matrix attached at load time when it lines up with the signals
+        emb_matrix = cluster.get("_emb_matrix")
+        if emb_matrix is not None and len(emb_matrix) == len(signals):
+            visible_matrix = emb_matrix[order]
+        else:
+            visible_matrix = _stack_vectors([emb for _, emb in visible_signals])
+
+        # Add visible signal nodes
+        for i, (s, emb) in enumerate(visible_signals):
+            short_label = s["text"][:40] + "…"
+            G.add_node(
+                s["signal_id"],
+                label="",  # Hide label for cleanliness
+                title=s["text"],  # Full text on hover
+                size=6,
+                color="#8ecae6",
+                physics=True,  # Enable physics for dragging
+                shape='dot',  # Explicitly set shape to dot to minimize borders
+                borderWidth=0,  # Remove outer circle
+                borderWidthSelected=0
+            )
+
+        # Add signal-signal edges (only between visible signals and only strong connections)
+        # All pairwise similarities come from one batched kernel call
+        # Fade edge color for large clusters
+        edge_opacity = 1.0 if total_signal_count < 50 else 0.5 if total_signal_count < 100 else 0.3
+        edge_color = f"rgba(14, 17, 23, {edge_opacity})"
+        for i, j, sim in zip(*_similar_pairs(visible_matrix, 0.65)):  # Higher threshold for cleaner graph
+            G.add_edge(
+                visible_signals[i][0]["signal_id"],
+                visible_signals[j][0]["signal_id"],
+                value=float(sim),
+                color=edge_color,
+                smooth=False  # Straight lines
+            )
+
+        # Calculate logarithmic cluster node size based on total signal count
+        # Formula: base_size + log_factor * log(1 + signal_count)
+        base_size = 35
+        log_factor = 15
+        cluster_size = base_size + log_factor * math.log(1 + total_signal_count)
+        
+        # Add cluster anchor node
+        cluster_node_id = f"cluster_{cluster_id}"
+        G.add_node(
+            cluster_node_id,
+            label=cluster_label,
+            title=f"{cluster_label} ({total_signal_count} signals)",
+            size=cluster_size,
+            color="#f4b000",
+            font={"size": 18, "color": "white"},
+            physics=True,  # Enable physics for dragging
+            borderWidth=0,
+            borderWidthSelected=0
+        )
+
+        # Connect cluster to visible signals
+        # Fade edge color for large clusters
+        edge_opacity = 1.0 if total_signal_count < 50 else 0.6 if total_signal_count < 100 else 0.4
+        cluster_edge_color = f"rgba(244, 176, 0, {edge_opacity})"
+        
+        for s, emb in visible_signals:
+            G.add_edge(
+                cluster_node_id,
+                s["signal_id"],
+                value=0.9,
+                color=cluster_edge_color,
+                smooth=False  # Straight lines
+            )
+        
+        # Add "+N more" collapsed node if there are hidden signals
+        if hidden_count > 0:
+            collapsed_node_id = f"collapsed_{cluster_id}"
+            G.add_node(
+                collapsed_node_id,
+                label=f"+{hidden_count} more",
+                title=f"This cluster has {hidden_count} more signals not shown in the graph.\nSelect the cluster below to view all {total_signal_count} signals.",
+                size=12,
+                color="#ff9500",
+                font={"size": 14, "color": "white"},
+                physics=True,
+                borderWidth=0,
+                borderWidthSelected=0,
+                shape='box'
+            )
+            
+            # Connect collapsed node to cluster hub
+            G.add_edge(
+                cluster_node_id,
+                collapsed_node_id,
+                value=0.9,
+                color="#ff9500",
+                smooth=False,
+                dashes=True
+            )
+
+    # Cross-cluster edges
+    # Unit centroids (and their norms) are cached on the clusters, shared with search
+    with_centroids = _clusters_with_centroids(clusters)
+    if len(with_centroids) > 1:
+        C_unit = get_centroid_matrix(with_centroids)
+        S = C_unit @ C_unit.T
+        for i, j in np.argwhere(np.triu(S, 1) > 0.7):
+            G.add_edge(
+                f"cluster_{with_centroids[i]['cluster_id']}",
+                f"cluster_{with_centroids[j]['cluster_id']}",
+                value=float(S[i, j]),
+                color="#ff006e",
+                dashes=True,
+                smooth=False  # Straight lines
+            )
+
+    net = Network(height="600px", bgcolor="#0e1117", font_color="white")
+    net.from_nx(G)
+    
+    # Configure physics for initial layout only - will be disabled after stabilization
+    net.set_options(_PHYSICS_OPTIONS_JSON)
+    
+    try:
+        # Render in memory and inject the custom script before the closing body tag,
+        # so the file is written once instead of write/read/rewrite.
+        # (lib/ assets that write_html would copy are already checked in.)
+        html_content = net.generate_html().replace("</body>", _CUSTOM_HTML_BODY_END)
         
         with open("cluster_graph.html", "w", encoding="utf-8") as f:
             f.write(html_content)
             
     except Exception as e:
-        with open("cluster_graph.html", "w") as f:
+        with open("cluster_graph.html", "w", encoding="utf-8") as f:
             f.write(f"<html><body><h3>Cluster Graph (pyvis error: {e})</h3><p>Clusters: {len(clusters)}</p></body></html>")
@@ -1,9 +1,17 @@
 # src/dashboard/search.py
 
-from typing import List, Dict, Any, Set
+import heapq
+from functools import lru_cache
+from typing import List, Dict, Any, Set, FrozenSet, Optional
 import numpy as np
-import re
 import string
+from src.utils.vectors import quantize_int8
+
+# Optional SIMD kernels (int8 cosine for the query-vs-centroids pass)
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
 
 
 # Common English stopwords to filter out
@@ -12,7 +20,11 @@ STOPWORDS = {
     'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the', 'to', 'was', 'will', 'with'
 }
 
+# Punctuation -> space translation table, built once
+_PUNCT_TABLE = str.maketrans(string.punctuation, ' ' * len(string.punctuation))
+
 
+@lru_cache(maxsize=256)
 def normalize_text(text: str) -> str:
     """
     Normalize text for consistent processing.
@@ -28,16 +40,9 @@ def normalize_text(text: str) -> str:
     Returns:
         Normalized text string
     """
-    # Lowercase
-    text = text.lower()
-    
-    # Remove punctuation but keep spaces
-    text = text.translate(str.maketrans(string.punctuation, ' ' * len(string.punctuation)))
-    
-    # Collapse repeated whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    return text
+    # Lowercase, replace punctuation with spaces, then collapse whitespace
+    # runs (str.split() with no argument also strips both ends)
+    return ' '.join(text.lower().translate(_PUNCT_TABLE).split())
 
 
 def extract_keywords(text: str) -> Set[str]:
@@ -70,20 +75,81 @@ def extract_keywords(text: str) -> Set[str]:
     return keywords
 
 
-def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
-    """Compute cosine similarity between two vectors."""
-    a = np.array(vec1)
-    b = np.array(vec2)
-    return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+@lru_cache(maxsize=256)
+def _query_keywords(query: str) -> FrozenSet[str]:
+    """Keywords of a search query, memoized (frozenset so cached results can't be mutated)."""
+    return frozenset(extract_keywords(query))
+
+
+@lru_cache(maxsize=256)
+def _embed_query(embedding_model, query: str) -> np.ndarray:
+    """Query embedding as float32, memoized so repeated queries skip the forward pass."""
+    vector = np.asarray(embedding_model.embed(query), dtype=np.float32)
+    vector.setflags(write=False)
+    return vector
+
 
+def get_centroid_norm(cluster: Dict[str, Any]) -> float:
+    """Return the cluster centroid's L2 norm, caching it on the cluster dict."""
+    norm = cluster.get("_centroid_norm")
+    if norm is None:
+        c = np.asarray(cluster["centroid"], dtype=np.float32)
+        norm = float(np.sqrt(np.vdot(c, c)))
+        cluster["_centroid_norm"] = norm
+    return norm
 
-def compute_lexical_score(query_keywords: Set[str], cluster_signals: List[Dict[str, Any]]) -> float:
+
+def get_centroid_matrix(clusters: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Stack unit-normalized cluster centroids into one (C, d) float32 matrix.
+
+    Each cluster's unit centroid is cached as 'centroid_unit' (the same key
+    evolve_clusters maintains), so repeated searches only pay for the stack.
+    """
+    rows = []
+    for cluster in clusters:
+        unit = cluster.get("centroid_unit")
+        if unit is None:
+            centroid = np.asarray(cluster["centroid"], dtype=np.float32)
+            unit = centroid / (get_centroid_norm(cluster) + 1e-12)
+            cluster["centroid_unit"] = unit
+        rows.append(unit)
+    return np.stack(rows).astype(np.float32, copy=False)
+
+
+def get_centroid_matrix_i8(clusters: List[Dict[str, Any]]) -> np.ndarray:
+    """Stack int8-quantized centroids into one (C, d) matrix, cached on each cluster as 'centroid_i8'."""
+    rows = []
+    for cluster in clusters:
+        quantized = cluster.get("centroid_i8")
+        if quantized is None:
+            quantized = quantize_int8(cluster["centroid"])
+            cluster["centroid_i8"] = quantized
+        rows.append(quantized)
+    return np.stack(rows)
+
+
+def ensure_cluster_keywords(cluster: Dict[str, Any]) -> Set[str]:
+    """
+    Return the union of keywords over a cluster's signals, cached on the cluster.
+
+    The cache ('_keywords') is tagged with the signal count it was built from, so
+    copies with a filtered signal list (e.g. the time filter) rebuild it.
+    """
+    signals = cluster.get("signals", [])
+    if cluster.get("_keywords_signal_count") != len(signals):
+        cluster["_keywords"] = set().union(*(extract_keywords(s.get('text', '')) for s in signals))
+        cluster["_keywords_signal_count"] = len(signals)
+    return cluster["_keywords"]
+
+
+def compute_lexical_score(query_keywords: Set[str], cluster_keywords: Set[str]) -> float:
     """
     Compute lexical overlap score between query and cluster signals.
     
     Args:
         query_keywords: Set of keywords from user query
-        cluster_signals: List of signal dictionaries with 'text' field
+        cluster_keywords: Keyword set of the cluster (see ensure_cluster_keywords)
     
     Returns:
         Lexical overlap ratio (0.0 to 1.0)
@@ -91,12 +157,6 @@ def compute_lexical_score(query_keywords: Set[str], cluster_signals: List[Dict[s
     if not query_keywords:
         return 0.0
     
-    # Extract keywords from all signal titles in cluster
-    cluster_keywords = set()
-    for signal in cluster_signals:
-        signal_text = signal.get('text', '')
-        cluster_keywords.update(extract_keywords(signal_text))
-    
     # Compute overlap
     overlap = query_keywords.intersection(cluster_keywords)
     
@@ -106,11 +166,17 @@ def compute_lexical_score(query_keywords: Set[str], cluster_signals: List[Dict[s
     return lexical_score
 
 
+def _rank_key(result: Dict[str, Any]):
+    """Sort key for search results: final_score, then signal_count as tie-breaker."""
+    return (result["final_score"], result.get("signal_count", 0))
+
+
 def search_clusters_hybrid(
     query: str,
     clusters: List[Dict[str, Any]],
     embedding_model,
-    min_final_score: float = 0.35
+    min_final_score: float = 0.35,
+    top_k: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Hybrid search combining semantic similarity and lexical overlap.
@@ -126,6 +192,8 @@ def search_clusters_hybrid(
         clusters: List of all clusters (active + candidate)
         embedding_model: The embedding model to encode the query
         min_final_score: Minimum final score threshold (default: 0.35)
+        top_k: If set, return only the top_k best results (partial heap select
+            instead of a full sort)
     
     Returns:
         List of matching clusters sorted by final_score, with metadata:
@@ -139,27 +207,39 @@ def search_clusters_hybrid(
         return []
     
     # Normalize query and extract keywords
-    query_keywords = extract_keywords(query)
+    query_keywords = _query_keywords(query)
     
     # Embed the user query
     try:
-        query_embedding = embedding_model.embed(query)
+        query_embedding = _embed_query(embedding_model, query)
     except Exception as e:
         print(f"Error embedding query: {e}")
         return []
     
     results = []
+    searchable = []
     
     for cluster in clusters:
         # Compute centroid if missing
         if "centroid" not in cluster and cluster.get("signals"):
             try:
                 signal_texts = [s.get("text", "") for s in cluster["signals"]]
-                if signal_texts:
-                    signal_embeddings = [embedding_model.embed(text) for text in signal_texts]
-                    # Compute centroid (mean of embeddings)
-                    centroid = np.mean(np.array(signal_embeddings), axis=0).tolist()
+                emb_matrix = cluster.get("_emb_matrix")
+                if emb_matrix is not None and len(emb_matrix) == len(signal_texts):
+                    # Embeddings already loaded with the cluster; no need to re-encode
+                    signal_embeddings = emb_matrix
+                elif signal_texts:
+                    signal_embeddings = np.array([embedding_model.embed(text) for text in signal_texts])
+                else:
+                    signal_embeddings = None
+                if signal_embeddings is not None:
+                    # Compute centroid (mean of embeddings), kept as a float32 ndarray
+                    centroid = np.add.reduce(signal_embeddings, axis=0, dtype=np.float32)
+                    centroid /= len(signal_embeddings)
                     cluster["centroid"] = centroid
+                    cluster.pop("_centroid_norm", None)
+                    cluster.pop("centroid_unit", None)
+                    cluster.pop("centroid_i8", None)
             except Exception as e:
                 print(f"Error computing centroid for cluster {cluster.get('cluster_id', 'unknown')}: {e}")
                 continue
@@ -168,12 +248,26 @@ def search_clusters_hybrid(
         if "centroid" not in cluster:
             continue
         
+        searchable.append(cluster)
+    
+    if not searchable:
+        return []
+    
+    # Semantic scores for every cluster in one batched call
+    if simsimd is not None:
+        q8 = quantize_int8(query_embedding)[None, :]
+        sims = 1.0 - np.asarray(simsimd.cdist(q8, get_centroid_matrix_i8(searchable), metric="cosine"))[0]
+    else:
+        q = np.asarray(query_embedding, dtype=np.float32)
+        q = q / (np.linalg.norm(q) + 1e-12)
+        sims = get_centroid_matrix(searchable) @ q
+    
+    for i, cluster in enumerate(searchable):
         # 1. Compute semantic score (embedding-based)
-        semantic_score = cosine_similarity(query_embedding, cluster["centroid"])
+        semantic_score = float(sims[i])
         
         # 2. Compute lexical score (keyword-based)
-        cluster_signals = cluster.get("signals", [])
-        lexical_score = compute_lexical_score(query_keywords, cluster_signals)
+        lexical_score = compute_lexical_score(query_keywords, ensure_cluster_keywords(cluster))
         
         # 3. Compute final score (weighted combination)
         final_score = 0.7 * semantic_score + 0.3 * lexical_score
@@ -195,10 +289,9 @@ def search_clusters_hybrid(
             results.append(result)
     
     # Sort by final_score (desc), then signal_count (desc) as tie-breaker
-    results.sort(
-        key=lambda x: (x["final_score"], x.get("signal_count", 0)),
-        reverse=True
-    )
+    if top_k is not None:
+        return heapq.nlargest(top_k, results, key=_rank_key)
+    results.sort(key=_rank_key, reverse=True)
     
     return results
 
@@ -117,11 +117,18 @@ def filter_clusters_by_time(
             if "embeddings" in cluster and len(cluster["embeddings"]) == original_count:
                 # Map filtered signals to their original indices by signal_id
                 recent_signal_ids = {s.get("signal_id") for s in recent_signals}
-                filtered_embeddings = []
-                for i, signal in enumerate(original_signals):
-                    if signal.get("signal_id") in recent_signal_ids:
-                        filtered_embeddings.append(cluster["embeddings"][i])
-                filtered_cluster["embeddings"] = filtered_embeddings
+                keep = [
+                    i for i, signal in enumerate(original_signals)
+                    if signal.get("signal_id") in recent_signal_ids
+                ]
+                filtered_cluster["embeddings"] = [cluster["embeddings"][i] for i in keep]
+                # Keep the cached embedding matrices row-aligned with the filtered signals
+                for key in ("_emb_matrix", "_emb_unit"):
+                    if key in cluster:
+                        filtered_cluster[key] = cluster[key][keep]
+            else:
+                filtered_cluster.pop("_emb_matrix", None)
+                filtered_cluster.pop("_emb_unit", None)
             
             filtered_clusters.append(filtered_cluster)
     
@@ -1,13 +1,95 @@
 # src/embeddings/embedding_model.py
 
-from typing import List
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
+# Number of recently embedded texts kept in memory (feeds repost the same items)
+EMBED_CACHE_SIZE = 10_000
+
+# Where downloaded/exported ONNX models are kept when use_onnx=True
+ONNX_CACHE_DIR = Path.home() / ".cache" / "signalweave"
+
 
 class EmbeddingModel:
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_size: int = EMBED_CACHE_SIZE,
+        use_onnx: bool = False
+    ):
+        self.model = self._load_model(model_name, use_onnx)
+        # LRU cache keyed by text; per instance, so each model has its own entries
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = Lock()
+
+    @staticmethod
+    def _load_model(model_name: str, use_onnx: bool) -> SentenceTransformer:
+        if use_onnx:
+            # ONNX Runtime backend (fused CPU kernels); sentence-transformers keeps the
+            # model's own pooling/normalize modules, so outputs match the PyTorch path.
+            # The ONNX export is fetched or created once and cached under ONNX_CACHE_DIR.
+            try:
+                ONNX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                return SentenceTransformer(
+                    model_name, backend="onnx", cache_folder=str(ONNX_CACHE_DIR)
+                )
+            except Exception as e:
+                print(f"[WARNING] ONNX backend unavailable ({e}); falling back to PyTorch")
+        return SentenceTransformer(model_name)
+
+    def _cache_get(self, text: str) -> Optional[np.ndarray]:
+        with self._cache_lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+            return vector
+
+    def _cache_put(self, text: str, vector: np.ndarray):
+        with self._cache_lock:
+            self._cache[text] = vector
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
 
     def embed(self, text: str) -> List[float]:
-        embedding = self.model.encode(text)
-        return embedding.tolist()
\ No newline at end of file
+        embedding = self._cache_get(text)
+        if embedding is None:
+            embedding = self.model.encode(
+                text, normalize_embeddings=True, show_progress_bar=False
+            ).astype(np.float32, copy=False)
+            self._cache_put(text, embedding)
+        return embedding.tolist()
+
+    def embed_batch(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        # One encode call for all texts amortizes tokenizer/forward-pass overhead.
+        # Returns an (n, d) array of unit vectors so callers can keep them in NumPy
+        # and treat cosine similarity as a plain dot product.
+        if not texts:
+            return np.empty((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        found = {}
+        for text in dict.fromkeys(texts):
+            embedding = self._cache_get(text)
+            if embedding is not None:
+                found[text] = embedding
+
+        # Only encode texts not seen recently (each distinct text once)
+        missing = [text for text in dict.fromkeys(texts) if text not in found]
+        if missing:
+            encoded = self.model.encode(
+                missing,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+            for text, embedding in zip(missing, encoded.astype(np.float32, copy=False)):
+                found[text] = embedding
+                self._cache_put(text, embedding)
+
+        return np.stack([found[text] for text in texts])
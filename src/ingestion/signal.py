@@ -1,27 +1,25 @@
 # src/ingestion/signal.py
 
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, Any
 
 
+# slots: fixed attribute layout, no per-instance __dict__ (ingestion creates many Signals)
+@dataclass(slots=True)
 class Signal:
-    def __init__(
-        self,
-        signal_id: str,
-        text: str,
-        timestamp: datetime,
-        source: str,
-        domain: str,
-        subdomain: str,
-        metadata: Dict[str, Any] = None
-    ):
-        self.signal_id = signal_id
-        self.text = text
-        self.timestamp = timestamp
-        self.source = source
-        self.domain = domain
-        self.subdomain = subdomain
-        self.metadata = metadata or {}
+    signal_id: str
+    text: str
+    timestamp: datetime
+    source: str
+    domain: str
+    subdomain: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # Callers may pass metadata=None explicitly
+        if self.metadata is None:
+            self.metadata = {}
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -44,4 +42,4 @@ class Signal:
             domain=data["domain"],
             subdomain=data["subdomain"],
             metadata=data.get("metadata", {})
-        )
\ No newline at end of file
+        )
@@ -2,15 +2,29 @@
 
 import json
 import os
+from pathlib import Path
+import numpy as np
 from typing import List, Dict, Any
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient
 
+from src.utils.trace import LazyTrace
+
+# Optional fast JSON codec (native NumPy support); stdlib json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
 CANDIDATE_STORE_FILE = "candidate_clusters.json"
 
+# Runtime-only lookup structures rebuilt by evolve_clusters and search, never persisted.
+# Keys starting with "_" (e.g. _emb_matrix, _keywords) are runtime caches as well.
+TRANSIENT_KEYS = {"signal_id_set", "centroid_unit", "centroid_i8"}
+
 
 def get_qdrant_client():
     """Get Qdrant Cloud client if credentials available, otherwise fallback to JSON"""
@@ -18,7 +32,8 @@ def get_qdrant_client():
         return QdrantClient(
             url=os.getenv("QDRANT_URL"),
             api_key=os.getenv("QDRANT_API_KEY"),
-            timeout=30
+            timeout=30,
+            prefer_grpc=True  # gRPC (port 6334) for the bulk scrolls below
         )
     return None
 
@@ -135,23 +150,86 @@ def load_candidates_from_qdrant() -> List[Dict[str, Any]]:
         return None
 
 
+def attach_embedding_matrix(cluster: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a cluster's per-signal embedding lists into contiguous float32 matrices.
+
+    Sets _emb_matrix (n, d) and its row-normalized copy _emb_unit, so graph,
+    search and scoring code can run BLAS ops without re-converting lists.
+    The plain "embeddings" list is left as-is for serialization.
+    """
+    embeddings = cluster.get("embeddings")
+    if embeddings is not None and len(embeddings) > 0:
+        try:
+            matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        except (TypeError, ValueError):
+            matrix = None
+        if matrix is None or matrix.ndim != 2:
+            # Ragged or None rows: leave the cluster without matrix caches
+            print(f"[WARNING] Malformed embeddings in cluster {cluster.get('cluster_id')}, skipping matrix cache")
+            return cluster
+        cluster["_emb_matrix"] = matrix
+        cluster["_emb_unit"] = matrix / (np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12)
+    return cluster
+
+
 def load_candidates() -> List[Dict[str, Any]]:
     """Load clusters from Qdrant Cloud (preferred) or fallback to JSON file"""
     # Try Qdrant Cloud first
     clusters = load_candidates_from_qdrant()
     if clusters is not None:
         print(f"[INFO] Loaded {len(clusters)} clusters from Qdrant Cloud")
-        return clusters
+        return [attach_embedding_matrix(c) for c in clusters]
     
     # Fallback to JSON file
     if not os.path.exists(CANDIDATE_STORE_FILE):
         return []
     
-    print(f"[INFO] Loaded clusters from local JSON file (fallback)")
-    with open(CANDIDATE_STORE_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    print("[INFO] Loaded clusters from local JSON file (fallback)")
+    return [attach_embedding_matrix(c) for c in _loads(Path(CANDIDATE_STORE_FILE).read_bytes())]
+
+
+def _json_default(obj):
+    """Serialize NumPy values kept on clusters (embeddings, centroids) and lazy traces"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, LazyTrace):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _persistable(cluster: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop runtime-only keys before writing a cluster to disk"""
+    return {
+        k: v for k, v in cluster.items()
+        if k not in TRANSIENT_KEYS and not k.startswith("_")
+    }
+
+
+def _dumps(obj) -> bytes:
+    """Encode to indented UTF-8 JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=_json_default
+        )
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def _loads(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _atomic_write(path: str, data: bytes):
+    """Write to a temp file and rename over path, so readers never see a partial file"""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
 
 
 def save_candidates(candidates: List[Dict[str, Any]]):
-    with open(CANDIDATE_STORE_FILE, "w", encoding="utf-8") as f:
-        json.dump(candidates, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+    _atomic_write(CANDIDATE_STORE_FILE, _dumps([_persistable(c) for c in candidates]))
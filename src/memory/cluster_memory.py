@@ -6,6 +6,7 @@ from qdrant_client import QdrantClient
 from qdrant_client.http.models import Distance, VectorParams, PointStruct
 
 from src.embeddings.embedding_model import EmbeddingModel
+from src.utils.trace import serializable_decision
 
 
 class ClusterMemory:
@@ -37,20 +38,11 @@ class ClusterMemory:
                 )
             )
 
-    def upsert_cluster(
-        self,
-        proto_cluster: Dict[str, Any],
-        embedding_model: EmbeddingModel
-    ):
-        texts = [s["text"] for s in proto_cluster["signals"]]
-        combined_text = " ".join(texts)
-
-        vector = embedding_model.embed(combined_text)
-
+    def _cluster_point(self, proto_cluster: Dict[str, Any], vector: List[float]) -> PointStruct:
         # Use cluster UUID directly as string ID (Qdrant supports UUID strings)
         cluster_id_str = proto_cluster["cluster_id"]
 
-        point = PointStruct(
+        return PointStruct(
             id=cluster_id_str,  # Use UUID directly as string ID
             vector=vector,
             payload={
@@ -61,11 +53,42 @@ class ClusterMemory:
                 "member_signal_ids": [s["signal_id"] for s in proto_cluster["signals"]],
                 "growth_ratio": proto_cluster.get("growth_ratio", 1.0),
                 "critic_report": proto_cluster.get("critic_report"),
-                "controller_decision": proto_cluster.get("controller_decision")
+                "controller_decision": serializable_decision(proto_cluster.get("controller_decision"))
             }
         )
 
+    def upsert_cluster(
+        self,
+        proto_cluster: Dict[str, Any],
+        embedding_model: EmbeddingModel
+    ):
+        texts = [s["text"] for s in proto_cluster["signals"]]
+        combined_text = " ".join(texts)
+
+        vector = embedding_model.embed(combined_text)
+
         self.client.upsert(
             collection_name=self.collection_name,
-            points=[point]
-        )
\ No newline at end of file
+            points=[self._cluster_point(proto_cluster, vector)]
+        )
+
+    def upsert_clusters_bulk(
+        self,
+        clusters: List[Dict[str, Any]],
+        embedding_model: EmbeddingModel,
+        batch_size: int = 256
+    ):
+        """Embed all clusters in one batched encode and upsert them in as few requests as possible."""
+        if not clusters:
+            return
+
+        combined_texts = [" ".join(s["text"] for s in c["signals"]) for c in clusters]
+        vectors = embedding_model.embed_batch(combined_texts).tolist()
+
+        points = [self._cluster_point(c, v) for c, v in zip(clusters, vectors)]
+        # Chunked only to stay under Qdrant's request size limit on very large runs
+        for start in range(0, len(points), batch_size):
+            self.client.upsert(
+                collection_name=self.collection_name,
+                points=points[start:start + batch_size]
+            )
@@ -2,6 +2,8 @@
 
 from typing import Dict, Any, List
 
+from src.utils.trace import LazyTrace
+
 
 def controller_decide(cluster: Dict[str, Any], critic_report: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -28,15 +30,15 @@ def controller_decide(cluster: Dict[str, Any], critic_report: Dict[str, Any]) ->
     # Decision logic
     if confidence == "high":
         final_action = "promote"
-        decision_trace = _generate_trace_high(metrics, flags)
+        decision_trace = LazyTrace(_generate_trace_high, (metrics, flags))
     
     elif confidence == "medium":
         final_action = "keep_candidate"
-        decision_trace = _generate_trace_medium(metrics, flags)
+        decision_trace = LazyTrace(_generate_trace_medium, (metrics, flags))
     
     else:  # low
         final_action = "demote_wait"
-        decision_trace = _generate_trace_low(metrics, flags)
+        decision_trace = LazyTrace(_generate_trace_low, (metrics, flags))
     
     return {
         "final_action": final_action,
@@ -1,7 +1,56 @@
 # src/scoring/critic_agent.py
 
+from functools import lru_cache
 from typing import Dict, Any, List
 
+from src.scoring.grounding_agent import (
+    cluster_source_ids,
+    compute_cluster_coherence,
+    compute_clusters_coherence,
+)
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Flag bits set by _classify_numeric, in report order (coherence, source diversity, signal count)
+_FLAG_NAMES = (
+    "very low coherence",
+    "weak coherence",
+    "high coherence",
+    "single source",
+    "multi-source validated",
+    "insufficient evidence",
+    "strong evidence",
+)
+_COHERENCE_FLAGS = frozenset(_FLAG_NAMES[:3])
+_CONFIDENCE_LEVELS = ("low", "medium", "high")
+
+
+def evaluate_clusters(clusters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Evaluate many clusters at once; returns the same reports as evaluate_cluster.
+    
+    The expensive part, the coherence fallback for clusters without a
+    precomputed coherence, runs as one batched NumPy pass over all of them.
+    """
+    pending = [c for c in clusters if _needs_coherence(c)]
+    batched = {id(c): coh for c, coh in zip(pending, compute_clusters_coherence(pending))}
+    return [_evaluate(c, batched.get(id(c))) for c in clusters]
+
+
+def _signal_count(cluster: Dict[str, Any]) -> int:
+    return cluster.get("signal_count", len(cluster.get("signals", [])))
+
+
+def _needs_coherence(cluster: Dict[str, Any]) -> bool:
+    # Below 3 signals confidence is LOW whatever the coherence, so skip the estimate
+    if _signal_count(cluster) < 3:
+        return False
+    embeddings = cluster.get("embeddings")
+    return cluster.get("coherence", 0.0) == 0.0 and embeddings is not None and len(embeddings) > 0
+
 
 def evaluate_cluster(cluster: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -18,55 +67,39 @@ def evaluate_cluster(cluster: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict with confidence level, flags, and recommended action
     """
-    
+    return _evaluate(cluster, None)
+
+
+def _evaluate(cluster: Dict[str, Any], fallback_coherence) -> Dict[str, Any]:
     # Extract metrics
-    signal_count = cluster.get("signal_count", len(cluster.get("signals", [])))
+    signal_count = _signal_count(cluster)
     
     # Source diversity
-    signals = cluster.get("signals", [])
-    unique_sources = len(set(s.get("source", "unknown") for s in signals))
+    unique_sources = len(set(cluster_source_ids(cluster)))
     
     # Semantic coherence (from grounding agent or compute on-the-fly)
     coherence = cluster.get("coherence", 0.0)
     
     # If coherence not pre-computed, estimate from embeddings
-    if coherence == 0.0 and cluster.get("embeddings"):
-        from src.scoring.grounding_agent import compute_cluster_grounding
-        grounding = compute_cluster_grounding(cluster)
-        coherence = grounding.get("coherence", 0.0)
-    
-    # Evaluation flags
-    flags = []
-    
-    # Coherence flags (relaxed thresholds)
-    if coherence < 0.30:
-        flags.append("very low coherence")
-    elif coherence < 0.40:
-        flags.append("weak coherence")
-    elif coherence >= 0.70:
-        flags.append("high coherence")
-    
-    # Source diversity flags
-    if unique_sources == 1:
-        flags.append("single source")
-    elif unique_sources >= 3:
-        flags.append("multi-source validated")
+    if _needs_coherence(cluster):
+        if fallback_coherence is not None:
+            # Already computed in a batch by evaluate_clusters
+            coherence = fallback_coherence
+        else:
+            coherence = compute_cluster_coherence(cluster)
     
-    # Signal count flags
+    # Evaluation flags and confidence classification
+    flags, confidence = _classify(signal_count, coherence, unique_sources)
     if signal_count < 3:
-        flags.append("insufficient evidence")
-    elif signal_count >= 10:
-        flags.append("strong evidence")
-    
-    # Confidence classification
-    confidence = _classify_confidence(signal_count, coherence, unique_sources)
+        # Coherence was not estimated for these, so don't flag it
+        flags = [flag for flag in flags if flag not in _COHERENCE_FLAGS]
     
     # Recommended action based on confidence
     recommended_action = _recommend_action(confidence, signal_count)
     
     return {
         "confidence": confidence,
-        "flags": flags,
+        "flags": list(flags),
         "recommended_action": recommended_action,
         "metrics": {
             "signal_count": signal_count,
@@ -76,35 +109,71 @@ def evaluate_cluster(cluster: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _classify_confidence(
-    signal_count: int, 
-    coherence: float, 
-    source_diversity: int
-) -> str:
+def _classify_numeric(signal_count, coherence, source_diversity):
     """
-    Classify cluster confidence level (relaxed for early weak signals).
+    Numeric core of the critic: returns (flag bitmask over _FLAG_NAMES, confidence code).
     
+    Only int/float comparisons, so it compiles with numba when available.
+    Confidence codes index _CONFIDENCE_LEVELS:
     HIGH: count ≥10, coherence ≥0.50, sources ≥2
     MEDIUM: count ≥3, coherence ≥0.40
     LOW: count <3 OR coherence <0.30 (rare, only extreme cases)
     """
+    mask = 0
+    
+    # Coherence (relaxed thresholds): <0.30 | <0.40 | <0.70 | >=0.70
+    if coherence < 0.30:
+        mask |= 1
+    elif coherence < 0.40:
+        mask |= 2
+    elif coherence < 0.70:
+        pass
+    else:
+        mask |= 4
+    
+    # Source diversity: 1 | >=3
+    if source_diversity >= 3:
+        mask |= 16
+    elif source_diversity == 1:
+        mask |= 8
+    
+    # Signal count: <3 | >=10
+    if signal_count < 3:
+        mask |= 32
+    elif signal_count >= 10:
+        mask |= 64
     
     # HIGH confidence criteria (meaningful emerging trend)
     if signal_count >= 10 and coherence >= 0.50 and source_diversity >= 2:
-        return "high"
+        return mask, 2
     
     # LOW confidence criteria (only extreme cases)
     # Single source is NOT an auto-disqualifier if signal count is high
     if signal_count < 3:
-        return "low"
+        return mask, 0
     if coherence < 0.30:
-        return "low"
+        return mask, 0
     
     # MEDIUM confidence (default - let clusters evolve)
     # Includes: 3-9 signals, coherence ≥0.30, any source diversity
-    return "medium"
+    return mask, 1
+
+
+if numba is not None:
+    _classify_numeric = numba.njit(cache=True)(_classify_numeric)
+
+
+# Pure function of a few discrete-ish metrics: memoized across clusters,
+# so the compiled kernel is only dispatched on a cache miss
+@lru_cache(maxsize=4096)
+def _classify(signal_count: int, coherence: float, source_diversity: int):
+    """Map the numeric classification back to (flag names, confidence string)."""
+    mask, level = _classify_numeric(signal_count, coherence, source_diversity)
+    flags = tuple(name for bit, name in enumerate(_FLAG_NAMES) if mask & (1 << bit))
+    return flags, _CONFIDENCE_LEVELS[level]
 
 
+@lru_cache(maxsize=4096)
 def _recommend_action(confidence: str, signal_count: int) -> str:
     """
     Recommend action based on confidence level.
@@ -11,13 +11,11 @@ def compute_emergence(
     now = datetime.utcnow()
     cutoff = now - timedelta(days=recent_days)
 
-    timestamps = [
-        datetime.fromisoformat(signal["timestamp"])
-        for signal in proto_cluster["signals"]
-    ]
-
-    recent_count = sum(1 for ts in timestamps if ts >= cutoff)
-    total_count = len(timestamps)
+    # Single pass: parse and compare each timestamp without keeping a datetime list
+    fromisoformat = datetime.fromisoformat
+    signals = proto_cluster["signals"]
+    recent_count = sum(fromisoformat(signal["timestamp"]) >= cutoff for signal in signals)
+    total_count = len(signals)
 
     growth_ratio = recent_count / total_count if total_count > 0 else 0.0
 
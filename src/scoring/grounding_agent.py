@@ -1,14 +1,119 @@
 # src/scoring/grounding_agent.py
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import numpy as np
 
 
-def cosine_similarity(a: List[float], b: List[float]) -> float:
-    """Compute cosine similarity between two vectors."""
-    a = np.array(a)
-    b = np.array(b)
-    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+# Sources are few and categorical: map each distinct source string to a small
+# int once, so diversity counting hashes ints instead of long feed URLs.
+# Process-local ids; never persist them.
+_SOURCE_IDS: Dict[str, int] = {}
+
+
+def _source_id(source: str) -> int:
+    return _SOURCE_IDS.setdefault(source, len(_SOURCE_IDS))
+
+
+def cluster_source_ids(cluster: Dict[str, Any]) -> List[int]:
+    """
+    The cluster's signal sources as interned int ids, cached on the cluster as _source_ids.
+    
+    A column view over the signal dicts so diversity counting only touches the
+    sources. Tagged with the signal count it was built from, so copies with a
+    filtered signal list rebuild it.
+    """
+    signals = cluster.get("signals", [])
+    if cluster.get("_source_ids_signal_count") != len(signals):
+        cluster["_source_ids"] = [_source_id(signal.get("source", "unknown")) for signal in signals]
+        cluster["_source_ids_signal_count"] = len(signals)
+    return cluster["_source_ids"]
+
+
+def _unit_embeddings(cluster: Dict[str, Any], embeddings) -> np.ndarray:
+    """Row-normalized float32 embedding matrix, cached on the cluster as _emb_unit."""
+    unit = cluster.get("_emb_unit")
+    if unit is not None and len(unit) == len(embeddings):
+        return unit
+    E = np.asarray(embeddings, dtype=np.float32)
+    unit = E / (np.linalg.norm(E, axis=1, keepdims=True) + 1e-12)
+    cluster["_emb_unit"] = unit
+    return unit
+
+
+def _mean_embedding(cluster: Dict[str, Any], embeddings) -> np.ndarray:
+    """Centroid of the embeddings as a float32 ndarray, reusing the loaded _emb_matrix if aligned."""
+    E = cluster.get("_emb_matrix")
+    if E is None or len(E) != len(embeddings):
+        E = np.asarray(embeddings, dtype=np.float32)
+    centroid = np.add.reduce(E, axis=0, dtype=np.float32)
+    centroid /= len(E)
+    return centroid
+
+
+def _centroid_similarities(unit: np.ndarray, c_unit: np.ndarray) -> np.ndarray:
+    """Cosine similarity of each unit row to the unit centroid (one float32 GEMV)."""
+    return unit @ c_unit
+
+
+def _mean_centroid_similarity(cluster: Dict[str, Any], embeddings, centroid) -> float:
+    """Mean cosine similarity of every embedding to the centroid."""
+    c = np.asarray(centroid, dtype=np.float32)
+    c_unit = c / (np.sqrt(np.vdot(c, c)) + 1e-12)
+    return float(_centroid_similarities(_unit_embeddings(cluster, embeddings), c_unit).mean())
+
+
+def compute_clusters_coherence(clusters: List[Dict[str, Any]]) -> List[Optional[float]]:
+    """
+    Coherence (mean cosine to centroid, rounded to 2 decimals) for many clusters at once.
+
+    Each cluster is scored with the same float32 GEMV as compute_cluster_coherence,
+    so both round identically. Returns None for clusters without embeddings or
+    with a centroid of the wrong dimension, so callers can fall back to
+    compute_cluster_coherence for those.
+    """
+    results: List[Optional[float]] = [None] * len(clusters)
+    for i, cluster in enumerate(clusters):
+        embeddings = cluster.get("embeddings")
+        if embeddings is None or len(embeddings) == 0:
+            continue
+        unit = _unit_embeddings(cluster, embeddings)
+        centroid = cluster.get("centroid")
+        if centroid is None or len(centroid) == 0:
+            centroid = _mean_embedding(cluster, embeddings)
+        c = np.asarray(centroid, dtype=np.float32)
+        if unit.ndim != 2 or c.shape != (unit.shape[1],):
+            continue
+        results[i] = round(_mean_centroid_similarity(cluster, embeddings, c), 2)
+    return results
+
+
+def compute_cluster_coherence(cluster: Dict[str, Any]) -> float:
+    """
+    Semantic coherence only: mean cosine similarity to centroid, rounded to 2 decimals.
+    
+    Same value as compute_cluster_grounding(cluster)["coherence"], without
+    building the rest of the grounding report.
+    """
+    embeddings = cluster.get("embeddings")
+    if embeddings is None:
+        embeddings = []
+    centroid = cluster.get("centroid")
+    
+    # Compute centroid if missing but embeddings are available
+    # (explicit None/len checks: embeddings and centroid may be NumPy arrays)
+    if (centroid is None or len(centroid) == 0) and len(embeddings) > 0:
+        centroid = _mean_embedding(cluster, embeddings)
+    
+    coherence = 0.0
+    if centroid is not None and len(centroid) > 0 and len(embeddings) > 0:
+        try:
+            # Average similarity to centroid
+            coherence = round(_mean_centroid_similarity(cluster, embeddings, centroid), 2)
+        except Exception as e:
+            # If coherence computation fails, log and default to 0.0
+            print(f"[WARNING] Coherence computation failed for cluster {cluster.get('cluster_id', 'unknown')}: {e}")
+            coherence = 0.0
+    return coherence
 
 
 def compute_cluster_grounding(cluster: Dict[str, Any], recent_days: int = 30) -> Dict[str, Any]:
@@ -38,35 +143,10 @@ def compute_cluster_grounding(cluster: Dict[str, Any], recent_days: int = 30) ->
     recency_pct = round(growth_ratio * 100, 1)
     
     # 3. Source Diversity - count unique sources
-    signals = cluster.get("signals", [])
-    unique_sources = set()
-    for signal in signals:
-        source = signal.get("source", "unknown")
-        unique_sources.add(source)
-    source_diversity = len(unique_sources)
+    source_diversity = len(set(cluster_source_ids(cluster)))
     
     # 4. Semantic Coherence - average cosine similarity to centroid
-    embeddings = cluster.get("embeddings", [])
-    centroid = cluster.get("centroid")
-    
-    # Compute centroid if missing but embeddings are available
-    if not centroid and embeddings:
-        centroid = np.mean(np.array(embeddings), axis=0).tolist()
-    
-    coherence = 0.0
-    if centroid and embeddings and len(embeddings) > 0:
-        try:
-            similarities = []
-            for embedding in embeddings:
-                sim = cosine_similarity(embedding, centroid)
-                similarities.append(sim)
-            
-            # Average similarity to centroid
-            coherence = round(np.mean(similarities), 2) if similarities else 0.0
-        except Exception as e:
-            # If coherence computation fails, log and default to 0.0
-            print(f"[WARNING] Coherence computation failed for cluster {cluster.get('cluster_id', 'unknown')}: {e}")
-            coherence = 0.0
+    coherence = compute_cluster_coherence(cluster)
     
     # Generate compact explanation string
     explanation = f"{signal_count} signals | {recency_pct:.0f}% recent | {source_diversity} sources | coherence {coherence:.2f}"
@@ -0,0 +1,36 @@
+# src/utils/trace.py
+
+from typing import Any, Callable, Dict, Tuple
+
+
+class LazyTrace:
+    """
+    Decision trace that is only formatted when it is turned into a string.
+
+    Pipelines that only read final_action never pay for the f-string work;
+    printing, f-strings and the JSON/Qdrant writers call str() on it.
+    """
+    __slots__ = ("fn", "args")
+
+    def __init__(self, fn: Callable[..., str], args: Tuple):
+        self.fn = fn
+        self.args = args
+
+    def __str__(self) -> str:
+        return self.fn(*self.args)
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __eq__(self, other) -> bool:
+        return str(self) == str(other)
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+
+def serializable_decision(decision: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a controller decision with the trace materialized as a plain string."""
+    if decision is None or not isinstance(decision.get("decision_trace"), LazyTrace):
+        return decision
+    return {**decision, "decision_trace": str(decision["decision_trace"])}
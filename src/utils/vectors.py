@@ -0,0 +1,16 @@
+# src/utils/vectors.py
+
+import numpy as np
+
+
+def quantize_int8(vectors) -> np.ndarray:
+    """
+    Symmetric int8 quantization, scaled per vector by its max |component|.
+
+    Cosine similarity is scale-invariant per vector, so the int8 copy can be
+    compared directly with SimSIMD's i8 kernels. Accepts (d,) or (n, d).
+    """
+    v = np.asarray(vectors, dtype=np.float32)
+    scale = np.abs(v).max(axis=-1, keepdims=True)
+    scale[scale == 0] = 1.0
+    return np.clip(np.round(v / scale * 127), -128, 127).astype(np.int8)
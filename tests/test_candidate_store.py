@@ -0,0 +1,127 @@
+# tests/test_candidate_store.py
+
+import json
+
+import numpy as np
+import pytest
+
+from src.memory import candidate_store
+from src.memory.candidate_store import load_candidates, save_candidates
+from src.utils.trace import LazyTrace
+
+
+def _runtime_cluster():
+    """A cluster as it looks after evolve_clusters/search/critic: arrays, caches and a lazy trace."""
+    embeddings = np.array([[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]], dtype=np.float32)
+    centroid = embeddings.mean(axis=0)
+    return {
+        "cluster_id": "c-1",
+        "signals": [
+            {"signal_id": "s1", "text": "Überraschung in quantum chips", "source": "feed-a"},
+            {"signal_id": "s2", "text": "quantum chips ship", "source": "feed-b"},
+        ],
+        "embeddings": embeddings,
+        "centroid": centroid,
+        "signal_count": np.int64(2),
+        "growth_ratio": np.float32(0.5),
+        "controller_decision": {
+            "final_action": "keep_candidate",
+            "decision_trace": LazyTrace(lambda n: f"Medium confidence ({n} signals)", (2,)),
+        },
+        # Runtime-only keys that must not reach disk
+        "signal_id_set": {"s1", "s2"},
+        "centroid_unit": centroid / np.linalg.norm(centroid),
+        "centroid_i8": np.array([1, 2, 3], dtype=np.int8),
+        "_emb_matrix": embeddings,
+        "_keywords": {"quantum", "chips"},
+        "_keywords_signal_count": 2,
+    }
+
+
+def _baseline_persisted(cluster):
+    """What the original json.dump writer stored for the same cluster (plain lists, str trace)."""
+    return {
+        "cluster_id": cluster["cluster_id"],
+        "signals": cluster["signals"],
+        "embeddings": cluster["embeddings"].tolist(),
+        "centroid": cluster["centroid"].tolist(),
+        "signal_count": 2,
+        "growth_ratio": 0.5,
+        "controller_decision": {
+            "final_action": "keep_candidate",
+            "decision_trace": "Medium confidence (2 signals)",
+        },
+    }
+
+
+@pytest.fixture
+def local_store(tmp_path, monkeypatch):
+    """Run against a JSON file in tmp_path with Qdrant disabled."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("QDRANT_URL", raising=False)
+    monkeypatch.delenv("QDRANT_API_KEY", raising=False)
+    return tmp_path
+
+
+def _assert_same_values(got, want):
+    assert got.keys() == want.keys()
+    for key, value in want.items():
+        if key in ("embeddings", "centroid"):
+            # orjson writes float32 arrays at float32 precision
+            np.testing.assert_array_equal(np.asarray(got[key], dtype=np.float32), np.asarray(value, dtype=np.float32))
+        else:
+            assert got[key] == value
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_save_load_round_trip(local_store, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(candidate_store, "orjson", None)
+    elif candidate_store.orjson is None:
+        pytest.skip("orjson not installed")
+
+    cluster = _runtime_cluster()
+    save_candidates([cluster])
+
+    # The file stays readable by the stdlib json reader and holds no runtime keys
+    on_disk = json.loads((local_store / candidate_store.CANDIDATE_STORE_FILE).read_text(encoding="utf-8"))
+    _assert_same_values(on_disk[0], _baseline_persisted(cluster))
+    assert not list(local_store.glob("*.tmp"))
+
+    loaded = load_candidates()
+    assert len(loaded) == 1
+    persisted = {k: v for k, v in loaded[0].items() if not k.startswith("_")}
+    _assert_same_values(persisted, _baseline_persisted(cluster))
+
+    # Loading rebuilds the float32 matrix caches
+    np.testing.assert_array_equal(loaded[0]["_emb_matrix"], cluster["embeddings"])
+    assert loaded[0]["_emb_matrix"].dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(loaded[0]["_emb_unit"], axis=1), 1.0, rtol=1e-5)
+
+
+def test_load_reads_baseline_file(local_store):
+    cluster = _runtime_cluster()
+    with open(candidate_store.CANDIDATE_STORE_FILE, "w", encoding="utf-8") as f:
+        json.dump([_baseline_persisted(cluster)], f, indent=2, ensure_ascii=False)
+
+    loaded = load_candidates()
+    persisted = {k: v for k, v in loaded[0].items() if not k.startswith("_")}
+    _assert_same_values(persisted, _baseline_persisted(cluster))
+
+
+def test_load_without_store_is_empty(local_store):
+    assert load_candidates() == []
+
+
+def test_load_skips_matrix_cache_for_malformed_embeddings(local_store):
+    good = _baseline_persisted(_runtime_cluster())
+    ragged = dict(good, cluster_id="c-ragged", embeddings=[[0.1, 0.2, 0.3], [0.1, 0.2]])
+    none_row = dict(good, cluster_id="c-none", embeddings=[[0.1, 0.2, 0.3], None])
+    with open(candidate_store.CANDIDATE_STORE_FILE, "w", encoding="utf-8") as f:
+        json.dump([ragged, none_row, good], f)
+
+    loaded = load_candidates()
+    assert [c["cluster_id"] for c in loaded] == ["c-ragged", "c-none", "c-1"]
+    for cluster in loaded[:2]:
+        assert "_emb_matrix" not in cluster and "_emb_unit" not in cluster
+    assert loaded[2]["_emb_matrix"].shape == (2, 3)
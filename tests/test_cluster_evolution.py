@@ -0,0 +1,144 @@
+# tests/test_cluster_evolution.py
+
+import copy
+import uuid
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+from src.clustering.cluster_evolution import evolve_clusters
+
+DIM = 32
+TOPICS = ["chips", "quantum", "power", "robots", "biotech"]
+
+
+class FakeEmbeddingModel:
+    """Deterministic stand-in: texts "<topic>:<n>" embed near their topic's direction."""
+
+    def __init__(self):
+        rng = np.random.default_rng(0)
+        self.topics = {t: rng.standard_normal(DIM).astype(np.float32) * 3 for t in TOPICS}
+
+    def embed(self, text):
+        topic = text.split(":")[0]
+        noise = np.random.default_rng(zlib.crc32(text.encode())).standard_normal(DIM)
+        v = (self.topics[topic] + noise).astype(np.float32)
+        return v / np.linalg.norm(v)
+
+    def embed_batch(self, texts):
+        return np.stack([self.embed(t) for t in texts]) if texts else np.zeros((0, DIM), np.float32)
+
+
+# Baseline implementation (before the batched/_CentroidIndex rewrite), kept for equivalence
+def _reference_cosine(a, b):
+    a = np.array(a)
+    b = np.array(b)
+    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def _reference_centroid(embeddings):
+    return np.mean(np.array(embeddings), axis=0).tolist()
+
+
+def _reference_evolve(existing_candidates, new_batch_clusters, embedding_model, similarity_threshold=0.70):
+    for c in existing_candidates:
+        if "centroid" not in c:
+            embeddings = [embedding_model.embed(s["text"]) for s in c["signals"]]
+            c["embeddings"] = embeddings
+            c["centroid"] = _reference_centroid(embeddings)
+
+    for new_cluster in new_batch_clusters:
+        new_embeddings = [embedding_model.embed(s["text"]) for s in new_cluster["signals"]]
+        new_centroid = _reference_centroid(new_embeddings)
+        merged = False
+        for candidate in existing_candidates:
+            if _reference_cosine(new_centroid, candidate["centroid"]) >= similarity_threshold:
+                existing_signal_ids = {s["signal_id"] for s in candidate["signals"]}
+                new_signals_to_add = [
+                    s for s in new_cluster["signals"] if s["signal_id"] not in existing_signal_ids
+                ]
+                if new_signals_to_add:
+                    candidate["signals"].extend(new_signals_to_add)
+                    candidate["embeddings"].extend(embedding_model.embed(s["text"]) for s in new_signals_to_add)
+                    candidate["centroid"] = _reference_centroid(candidate["embeddings"])
+                    candidate["signal_count"] = len(candidate["signals"])
+                merged = True
+                break
+        if not merged:
+            existing_candidates.append({
+                "cluster_id": str(uuid.uuid4()),
+                "signals": new_cluster["signals"],
+                "embeddings": new_embeddings,
+                "centroid": new_centroid,
+                "signal_count": len(new_cluster["signals"]),
+                "created_at": datetime.utcnow().isoformat()
+            })
+    return existing_candidates
+
+
+def _signal(text):
+    return {"signal_id": text, "text": text, "source": "feed", "timestamp": "2026-01-01T00:00:00"}
+
+
+def _scenario(model):
+    """Stored candidates (with and without centroids) plus a batch with overlaps, repeats and a new topic."""
+    stored = []
+    for topic in ("chips", "quantum", "power"):
+        signals = [_signal(f"{topic}:{i}") for i in range(4)]
+        embeddings = [model.embed(s["text"]).tolist() for s in signals]
+        stored.append({
+            "cluster_id": f"stored-{topic}",
+            "signals": signals,
+            "embeddings": embeddings,
+            "centroid": np.mean(embeddings, axis=0).tolist(),
+            "signal_count": len(signals),
+        })
+    # Loaded without a centroid: embedded during evolution
+    stored.append({"cluster_id": "stored-robots", "signals": [_signal("robots:0"), _signal("robots:1")], "signal_count": 2})
+
+    batch = []
+    for topic, ids in (("chips", [2, 3, 4, 5]), ("biotech", [0, 1, 2]), ("quantum", [7]),
+                       ("biotech", [2, 3]), ("robots", [1, 2]), ("power", [0, 1])):
+        signals = [_signal(f"{topic}:{i}") for i in ids]
+        cluster = {"signals": signals}
+        if topic != "quantum":
+            # cluster_batch output carries its signal embeddings
+            cluster["embeddings"] = model.embed_batch([s["text"] for s in signals])
+        batch.append(cluster)
+    return stored, batch
+
+
+def test_evolve_clusters_matches_reference():
+    model = FakeEmbeddingModel()
+    stored, batch = _scenario(model)
+
+    expected = _reference_evolve(copy.deepcopy(stored), copy.deepcopy(batch), model, similarity_threshold=0.5)
+    actual = evolve_clusters(copy.deepcopy(stored), copy.deepcopy(batch), model, similarity_threshold=0.5)
+
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        assert [s["signal_id"] for s in got["signals"]] == [s["signal_id"] for s in want["signals"]]
+        assert got["signal_count"] == want["signal_count"]
+        np.testing.assert_allclose(np.asarray(got["embeddings"]), np.asarray(want["embeddings"]), atol=1e-6)
+        np.testing.assert_allclose(np.asarray(got["centroid"]), np.asarray(want["centroid"]), atol=1e-5)
+        assert got["signal_id_set"] == {s["signal_id"] for s in got["signals"]}
+        unit = np.asarray(got["centroid"]) / np.linalg.norm(got["centroid"])
+        np.testing.assert_allclose(got["centroid_unit"], unit, atol=1e-5)
+    # Stored ids survive; only the first biotech batch cluster creates a candidate
+    assert [c["cluster_id"] for c in actual[:4]] == [c["cluster_id"] for c in stored]
+    assert len(actual) == 5
+
+
+def test_evolve_clusters_splits_below_threshold():
+    model = FakeEmbeddingModel()
+    stored, batch = _scenario(model)
+
+    expected = _reference_evolve(copy.deepcopy(stored), copy.deepcopy(batch), model, similarity_threshold=0.999)
+    actual = evolve_clusters(copy.deepcopy(stored), copy.deepcopy(batch), model, similarity_threshold=0.999)
+
+    # Nothing merges: every batch cluster becomes its own candidate
+    assert len(actual) == len(expected) == len(stored) + len(batch)
+    for got, want in zip(actual, expected):
+        assert [s["signal_id"] for s in got["signals"]] == [s["signal_id"] for s in want["signals"]]
+        np.testing.assert_allclose(np.asarray(got["centroid"]), np.asarray(want["centroid"]), atol=1e-5)
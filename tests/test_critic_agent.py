@@ -0,0 +1,127 @@
+# tests/test_critic_agent.py
+
+import copy
+import itertools
+
+import numpy as np
+
+from src.scoring import critic_agent
+from src.scoring.critic_agent import evaluate_cluster, evaluate_clusters
+from src.scoring.grounding_agent import compute_cluster_coherence, compute_clusters_coherence
+
+COHERENCE_FLAGS = {"very low coherence", "weak coherence", "high coherence"}
+# Values on and around every threshold the critic compares against
+BOUNDARY_COHERENCES = [0.01, 0.29, 0.30, 0.31, 0.39, 0.40, 0.41, 0.49, 0.50, 0.51, 0.69, 0.70, 0.71, 1.0]
+
+
+# Baseline rules (before the bisect/numba rewrite), kept for equivalence
+def _reference_report(signal_count, coherence, unique_sources):
+    flags = []
+    if coherence < 0.30:
+        flags.append("very low coherence")
+    elif coherence < 0.40:
+        flags.append("weak coherence")
+    elif coherence >= 0.70:
+        flags.append("high coherence")
+    if unique_sources == 1:
+        flags.append("single source")
+    elif unique_sources >= 3:
+        flags.append("multi-source validated")
+    if signal_count < 3:
+        flags.append("insufficient evidence")
+    elif signal_count >= 10:
+        flags.append("strong evidence")
+
+    if signal_count >= 10 and coherence >= 0.50 and unique_sources >= 2:
+        confidence = "high"
+    elif signal_count < 3 or coherence < 0.30:
+        confidence = "low"
+    else:
+        confidence = "medium"
+
+    if confidence == "high":
+        action = "promote"
+    elif confidence == "medium" and signal_count >= 3:
+        action = "keep_candidate"
+    else:
+        action = "demote_wait"
+    return {
+        "confidence": confidence,
+        "flags": flags,
+        "recommended_action": action,
+        "metrics": {"signal_count": signal_count, "source_diversity": unique_sources, "coherence": coherence},
+    }
+
+
+def _cluster(signal_count, coherence, unique_sources):
+    signals = [{"signal_id": str(i), "source": f"feed-{i % unique_sources}"} for i in range(signal_count)]
+    return {"signals": signals, "signal_count": signal_count, "coherence": coherence}
+
+
+def test_flags_and_confidence_match_reference_on_boundaries():
+    for signal_count, coherence, sources in itertools.product(
+        [3, 9, 10, 25], BOUNDARY_COHERENCES, [1, 2, 3, 4]
+    ):
+        sources = min(sources, signal_count)
+        report = evaluate_cluster(_cluster(signal_count, coherence, sources))
+        assert report == _reference_report(signal_count, coherence, sources), (signal_count, coherence, sources)
+
+
+def test_small_clusters_skip_coherence():
+    for signal_count, coherence, sources in itertools.product([1, 2], BOUNDARY_COHERENCES, [1, 2]):
+        sources = min(sources, signal_count)
+        expected = _reference_report(signal_count, coherence, sources)
+        # Below 3 signals coherence is not assessed, so no coherence flag is raised
+        expected["flags"] = [f for f in expected["flags"] if f not in COHERENCE_FLAGS]
+        assert evaluate_cluster(_cluster(signal_count, coherence, sources)) == expected
+
+
+def test_numeric_kernel_matches_python_fallback():
+    kernel = critic_agent._classify_numeric
+    python_kernel = getattr(kernel, "py_func", kernel)
+    for args in itertools.product([0, 1, 2, 3, 9, 10, 11], BOUNDARY_COHERENCES, [0, 1, 2, 3, 5]):
+        assert tuple(kernel(*args)) == tuple(python_kernel(*args))
+
+
+def test_evaluate_clusters_matches_per_cluster_evaluation():
+    rng = np.random.default_rng(7)
+    clusters = []
+    for i in range(40):
+        n = int(rng.integers(1, 15))
+        base = rng.standard_normal(16)
+        embeddings = base + rng.standard_normal((n, 16)) * rng.uniform(0.2, 2.0)
+        cluster = _cluster(n, 0.0, int(rng.integers(1, 4)) if n >= 3 else 1)
+        cluster["embeddings"] = embeddings if i % 2 else embeddings.tolist()
+        if i % 5 == 0:
+            cluster["coherence"] = 0.55  # precomputed, no fallback needed
+        clusters.append(cluster)
+
+    expected = [evaluate_cluster(c) for c in copy.deepcopy(clusters)]
+    assert evaluate_clusters(copy.deepcopy(clusters)) == expected
+
+
+def _near_rounding_boundary_clusters(count=400, dim=64):
+    """Random clusters whose raw coherence sits within 1e-3 of a 2-decimal rounding boundary."""
+    rng = np.random.default_rng(11)
+    clusters = []
+    while len(clusters) < count:
+        n = int(rng.integers(3, 40))
+        E = (rng.standard_normal(dim) + rng.standard_normal((n, dim)) * rng.uniform(0.3, 3.0)).astype(np.float32)
+        unit = E / np.linalg.norm(E, axis=1, keepdims=True)
+        c = E.mean(axis=0)
+        raw = float((unit @ (c / np.linalg.norm(c))).mean())
+        if abs((raw * 100) % 1 - 0.5) < 0.1:
+            cluster = _cluster(n, 0.0, 2)
+            del cluster["coherence"]
+            cluster["embeddings"] = E if len(clusters) % 2 else E.tolist()
+            clusters.append(cluster)
+    return clusters
+
+
+def test_batched_coherence_rounds_like_per_cluster_near_boundary():
+    clusters = _near_rounding_boundary_clusters()
+
+    expected = [compute_cluster_coherence(c) for c in copy.deepcopy(clusters)]
+    assert compute_clusters_coherence(copy.deepcopy(clusters)) == expected
+    expected_reports = [evaluate_cluster(c) for c in copy.deepcopy(clusters)]
+    assert evaluate_clusters(copy.deepcopy(clusters)) == expected_reports
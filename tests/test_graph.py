@@ -0,0 +1,41 @@
+# tests/test_graph.py
+
+import numpy as np
+import pytest
+
+pytest.importorskip("networkx")
+pytest.importorskip("pyvis")
+
+from src.dashboard.graph import _clusters_with_centroids, build_cluster_graph
+
+
+def _cluster(cluster_id, centroid):
+    rng = np.random.default_rng(len(cluster_id))
+    signals = [
+        {"signal_id": f"{cluster_id}-{i}", "text": f"signal {i} of {cluster_id}", "timestamp": f"2026-01-0{i + 1}"}
+        for i in range(3)
+    ]
+    return {
+        "cluster_id": cluster_id,
+        "label": cluster_id,
+        "signals": signals,
+        "embeddings": rng.standard_normal((3, 4)).tolist(),
+        "centroid": centroid,
+    }
+
+
+def test_malformed_centroids_get_no_cross_cluster_edges(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    clusters = [
+        _cluster("a", [1.0, 0.0, 0.0, 0.0]),
+        _cluster("b", [0.9, 0.1, 0.0, 0.0]),
+        _cluster("none", None),
+        _cluster("short", [1.0, 0.0]),
+    ]
+
+    assert [c["cluster_id"] for c in _clusters_with_centroids(clusters)] == ["a", "b"]
+
+    build_cluster_graph(clusters)
+    html = (tmp_path / "cluster_graph.html").read_text(encoding="utf-8")
+    assert "pyvis error" not in html
+    assert "cluster_none" in html and "cluster_short" in html